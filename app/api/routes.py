@@ -1,28 +1,49 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Union, get_args
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
 
 from app.config import settings
 from app.core.summary_prompts import normalize_summary_style_key
 from app.schemas import (
     GlobalSettings,
     GlobalSettingsUpdate,
+    JobChanges,
     JobCreateParams,
     JobCreateResponse,
-    JobListItem,
+    JobListPage,
+    JobState,
+    JobStatus,
+    JobStatusFields,
     JobStatusResponse,
+    JobView,
     QueueControlResponse,
+    RerunRequest,
+    SegmentPage,
     SummaryRequest,
 )
 from app.services.job_service import JobService
+from app.services.model_cache import model_cache_stats
+from app.services.scheduler import PRIORITY_LEVELS
 
 router = APIRouter(prefix="/api", tags=["api"])
 
+_TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+# Comment frames keep idle streams open through proxies.
+_STREAM_KEEPALIVE_SECONDS = 15.0
+_STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: str, payload: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
 
 def get_job_service() -> JobService:
     from app.main import job_service
@@ -30,6 +51,111 @@ def get_job_service() -> JobService:
     return job_service
 
 
+def _job_status_response(
+    job: JobState, service: JobService, estimated_start_at: datetime | None
+) -> JobStatusResponse:
+    return JobStatusResponse(
+        id=job.id,
+        filename=job.filename,
+        file_type=job.file_type,
+        status=job.status,
+        progress=job.progress,
+        step=job.step,
+        error=job.error,
+        events=job.events,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        params=job.params,
+        result=job.result.model_copy(update={"segments": list(service.segments(job))}),
+        duration_seconds=job.duration_seconds,
+        queue_position=service.queue_position(job.id),
+        estimated_start_at=estimated_start_at,
+        version=job.version,
+        cursor=service.change_cursor(job),
+    )
+
+
+# Everything the progress view needs; leaves out events, params, and the transcript.
+_SUMMARY_VIEW_FIELDS = (
+    "id",
+    "filename",
+    "file_type",
+    "status",
+    "progress",
+    "step",
+    "error",
+    "created_at",
+    "updated_at",
+    "duration_seconds",
+    "queue_position",
+    "estimated_start_at",
+    "version",
+    "cursor",
+)
+_DATETIME_JSON = TypeAdapter(Optional[datetime])
+
+
+def _job_status_fields(
+    job: JobState, service: JobService, fields: Sequence[str], estimated_start_at: datetime | None
+) -> Dict[str, Any]:
+    """
+    JSON-ready subset of `JobStatusResponse`, matching its full serialization field
+    for field. Only the requested fields are computed, so views without `result`
+    never build the transcript or touch the segment artifact.
+    """
+    getters: Dict[str, Callable[[], Any]] = {
+        "id": lambda: job.id,
+        "filename": lambda: job.filename,
+        "file_type": lambda: job.file_type,
+        "status": lambda: job.status,
+        "progress": lambda: job.progress,
+        "step": lambda: job.step,
+        "error": lambda: job.error,
+        "events": lambda: list(job.events),
+        "created_at": lambda: _DATETIME_JSON.dump_python(job.created_at, mode="json"),
+        "updated_at": lambda: _DATETIME_JSON.dump_python(job.updated_at, mode="json"),
+        "params": lambda: job.params.model_dump(mode="json"),
+        "result": lambda: job.result.model_copy(update={"segments": list(service.segments(job))}).model_dump(mode="json"),
+        "duration_seconds": lambda: job.duration_seconds,
+        "queue_position": lambda: service.queue_position(job.id),
+        "estimated_start_at": lambda: _DATETIME_JSON.dump_python(estimated_start_at, mode="json"),
+        "version": lambda: job.version,
+        "cursor": lambda: service.change_cursor(job),
+    }
+    return {name: getters[name]() for name in fields}
+
+
+def _requested_fields(view: JobView, fields: Optional[str]) -> Sequence[str] | None:
+    """Fields to project, or None for the full response."""
+    if fields is None:
+        return _SUMMARY_VIEW_FIELDS if view == "summary" else None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    unknown = sorted(set(requested) - set(JobStatusResponse.model_fields))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # "id" always comes along so projected responses stay self-describing.
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def _attachment_disposition(filename: str) -> str:
+    # Same header FileResponse sends, for responses that are streamed instead.
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # Weak comparison, as RFC 9110 requires for If-None-Match.
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
 @router.get("/config")
 def get_config() -> dict:
     service = get_job_service()
@@ -55,6 +181,11 @@ def get_config() -> dict:
     }
 
 
+@router.get("/system/caches")
+def get_cache_stats(service: JobService = Depends(get_job_service)) -> dict:
+    return {**model_cache_stats(), "exports": service.export_cache.stats()}
+
+
 @router.get("/settings/global", response_model=GlobalSettings)
 def get_global_settings(
     service: JobService = Depends(get_job_service),
@@ -79,10 +210,12 @@ async def create_job(
     device: str | None = Form(None),
     compute_type: str | None = Form(None),
     diarization: bool = Form(True),
+    trim_silence: bool = Form(False),
     summary_enabled: bool = Form(False),
     summary_style: str = Form("short"),
     output_formats: str = Form('["txt","srt","vtt","json"]'),
     speaker_name_overrides: str = Form("{}"),
+    priority: str = Form("normal"),
     service: JobService = Depends(get_job_service),
 ) -> JobCreateResponse:
     try:
@@ -105,6 +238,12 @@ async def create_job(
     if unknown:
         raise HTTPException(status_code=400, detail=f"Unsupported format(s): {unknown}")
 
+    if priority not in PRIORITY_LEVELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported priority: {priority}. Use one of {list(PRIORITY_LEVELS)}",
+        )
+
     global_settings = service.global_settings_service.get()
     normalized_summary_style = normalize_summary_style_key(summary_style) or "short"
 
@@ -117,6 +256,7 @@ async def create_job(
         device=device or global_settings.default_device,
         compute_type=compute_type or global_settings.compute_type,
         diarization=diarization,
+        trim_silence=trim_silence,
         summary_enabled=summary_enabled,
         summary_style=normalized_summary_style,
         retain_source_files=global_settings.retain_source_files,
@@ -124,6 +264,7 @@ async def create_job(
         retain_export_files=global_settings.retain_export_files,
         output_formats=selected_formats,
         speaker_name_overrides=speaker_overrides_dict,
+        priority=priority,
     )
     try:
         job_id = await service.create_job(file, params)
@@ -131,37 +272,179 @@ async def create_job(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return JobCreateResponse(job_id=job_id, status="queued")
+    # Jobs served from the transcript cache are already completed at this point.
+    return JobCreateResponse(job_id=job_id, status=service.get_job(job_id).status)
 
 
-@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
-def get_job(
-    job_id: str, service: JobService = Depends(get_job_service)
-) -> JobStatusResponse:
+@router.get("/jobs/stream")
+async def stream_jobs(
+    request: Request, service: JobService = Depends(get_job_service)
+) -> StreamingResponse:
+    """
+    Server-Sent Events: a `jobs` event with the list items of jobs that changed, and
+    the ids of deleted jobs, whenever any job changes.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        subscription = service.updates.subscribe()
+        try:
+            while not await request.is_disconnected():
+                changed = await subscription.wait(_STREAM_KEEPALIVE_SECONDS)
+                if not changed:
+                    yield ": keep-alive\n\n"
+                    continue
+                items, deleted = [], []
+                for job_id in sorted(changed):
+                    try:
+                        items.append(service.list_item(service.get_job(job_id)).model_dump(mode="json"))
+                    except KeyError:
+                        deleted.append(job_id)
+                yield _sse("jobs", {"items": items, "deleted": deleted})
+        finally:
+            service.updates.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_STREAM_HEADERS)
+
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_job(
+    job_id: str,
+    request: Request,
+    service: JobService = Depends(get_job_service),
+) -> StreamingResponse:
+    """
+    Server-Sent Events for one job: a `job` event with progress, step, status, new
+    events, and newly available segments on every change. The first event carries the
+    retained event log; the stream ends once the job reaches a terminal state.
+    """
     try:
         job = service.get_job(job_id)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail="Job not found") from exc
 
-    return JobStatusResponse(
-        id=job.id,
-        filename=job.filename,
-        file_type=job.file_type,
-        status=job.status,
-        progress=job.progress,
-        step=job.step,
-        error=job.error,
-        events=job.events,
-        created_at=job.created_at,
-        updated_at=job.updated_at,
-        params=job.params,
-        result=job.result,
-    )
-
+    async def events() -> AsyncIterator[str]:
+        subscription = service.updates.subscribe(job_id)
+        current = job
+        events_after = 0
+        # Segments that already exist were fetched with the job; only push later ones.
+        segments_revision = current.result.segments_revision
+        segments_after = current.result.segment_count
+        try:
+            while True:
+                changes = service.job_changes(current, events_after, segments_revision, segments_after)
+                events_after = changes["event_count"]
+                segments_revision = changes["segments_revision"]
+                segments_after = changes["segment_count"]
+                yield _sse("job", changes)
+                if current.status in _TERMINAL_STATUSES:
+                    return
+                while not await subscription.wait(_STREAM_KEEPALIVE_SECONDS):
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                if await request.is_disconnected():
+                    return
+                try:
+                    current = service.get_job(job_id)
+                except KeyError:
+                    yield _sse("deleted", {"id": job_id})
+                    return
+        finally:
+            service.updates.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_STREAM_HEADERS)
+
+
+@router.get("/jobs/{job_id}", response_model=Union[JobStatusResponse, JobChanges, JobStatusFields])
+def get_job(
+    job_id: str,
+    request: Request,
+    since: Optional[str] = Query(None, description="`cursor` from an earlier response; return only changes after it"),
+    view: JobView = Query("full", description="`summary` returns progress fields only, without events, params, or result"),
+    fields: Optional[str] = Query(None, description="Comma-separated response fields to return; overrides `view`"),
+    service: JobService = Depends(get_job_service),
+) -> Response:
+    try:
+        job = service.get_job(job_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail="Job not found") from exc
+    projection = _requested_fields(view, fields)
+
+    # The estimate is part of the ETag only for bodies that carry it, and computed once for both.
+    with_estimate = since is None and (projection is None or "estimated_start_at" in projection)
+    estimated_start_at = service.estimated_start(job.id) if with_estimate else None
+    etag = service.etag(job, estimated_start_at)
+    # no-cache: clients may keep the body but must revalidate it with If-None-Match.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    if since is not None:
+        try:
+            changes = service.job_delta(job, since)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return JSONResponse(changes, headers=headers)
+    if projection is not None:
+        return JSONResponse(_job_status_fields(job, service, projection, estimated_start_at), headers=headers)
+    return JSONResponse(_job_status_response(job, service, estimated_start_at).model_dump(mode="json"), headers=headers)
+
+
+@router.get("/jobs/{job_id}/segments", response_model=SegmentPage)
+def get_job_segments(
+    job_id: str,
+    request: Request,
+    start: Optional[float] = Query(None, ge=0, description="Window start in seconds"),
+    end: Optional[float] = Query(None, ge=0, description="Window end in seconds (exclusive)"),
+    speaker: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=1000),
+    service: JobService = Depends(get_job_service),
+) -> Response:
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    try:
+        job = service.get_job(job_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail="Job not found") from exc
 
-@router.get("/jobs", response_model=list[JobListItem])
-def list_jobs(service: JobService = Depends(get_job_service)) -> list[JobListItem]:
-    return service.list_jobs()
+    # Stored segments only change when they are rewritten under a new revision.
+    etag = f'W/"{job.result.segments_revision}-{job.result.segment_count}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    page = service.segment_page(job, start=start, end=end, speaker=speaker, offset=offset, limit=limit)
+    return JSONResponse(page.model_dump(mode="json"), headers=headers)
+
+
+@router.get("/jobs", response_model=JobListPage)
+def list_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    q: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    service: JobService = Depends(get_job_service),
+) -> JobListPage:
+    """
+    Jobs ordered by last update, newest first. Pass `next_cursor` back as `cursor` for
+    the next page; `status` accepts a comma-separated list.
+    """
+    statuses = [s.strip() for s in status.split(",") if s.strip()] if status else None
+    unknown = sorted(set(statuses or []) - set(get_args(JobStatus)))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown status: {', '.join(unknown)}")
+    try:
+        return service.list_jobs(
+            limit=limit,
+            cursor=cursor,
+            statuses=statuses,
+            filename=q.strip() if q else None,
+            created_from=created_from,
+            created_to=created_to,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.get("/jobs/{job_id}/download/{fmt}")
@@ -193,7 +476,7 @@ async def export_with_overrides(
 ):
     """
     Export a transcript file with custom speaker name overrides.
-    Generates the file on-the-fly with the provided overrides.
+    Renders are cached per job version, format, and normalized overrides.
     """
     try:
         job = service.get_job(job_id)
@@ -209,40 +492,31 @@ async def export_with_overrides(
         raise HTTPException(
             status_code=400, detail="Invalid speaker_name_overrides JSON object"
         ) from exc
+    if not isinstance(overrides_dict, dict):
+        raise HTTPException(status_code=400, detail="Invalid speaker_name_overrides JSON object")
 
-    # Generate export with overrides
-    from app.services.export_service import ExportService
-
-    export_service = ExportService()
-    job_dir = Path(job.source_path).parent
     base_name = Path(job.filename).stem or "transcript"
+    media_type = "application/json" if fmt == "json" else "text/plain"
+    safe_name = f"{base_name}.{fmt}"
+    cache_key = service.export_cache.key_for(job, fmt, overrides_dict)
+    file_path = service.export_cache.get(cache_key)
+    if file_path is not None:
+        return FileResponse(
+            path=file_path,
+            filename=safe_name,
+            media_type=media_type,
+        )
 
+    # Stream straight from the memory-mapped segments; the cache keeps a copy as it goes.
     result = {
         "text": job.result.transcript or "",
-        "segments": job.result.segments,
+        "segments": service.segments(job),
     }
-
-    files = export_service.write_outputs(
-        job_dir=job_dir,
-        base_name=f"{base_name}_export",
-        result=result,
-        output_formats=[fmt],
-        speaker_name_overrides=overrides_dict,
-    )
-
-    if fmt not in files:
-        raise HTTPException(status_code=500, detail="Export generation failed")
-
-    file_path = Path(files[fmt])
-    if not file_path.exists():
-        raise HTTPException(status_code=500, detail="Export file not found")
-
-    media_type = "application/json" if fmt == "json" else "text/plain"
-    safe_name = f"{base_name}.{fmt}"
-    return FileResponse(
-        path=file_path,
-        filename=safe_name,
-        media_type=media_type,
+    chunks = service.export_service.render(fmt, result, speaker_name_overrides=overrides_dict)
+    return StreamingResponse(
+        service.export_cache.stream_into(cache_key, chunks),
+        media_type=f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": _attachment_disposition(safe_name)},
     )
 
 
@@ -359,17 +633,28 @@ async def regenerate_summary(
     except RuntimeError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    return JobStatusResponse(
-        id=job.id,
-        filename=job.filename,
-        file_type=job.file_type,
-        status=job.status,
-        progress=job.progress,
-        step=job.step,
-        error=job.error,
-        events=job.events,
-        created_at=job.created_at,
-        updated_at=job.updated_at,
-        params=job.params,
-        result=job.result,
-    )
+    return _job_status_response(job, service, service.estimated_start(job.id))
+
+
+@router.post("/jobs/{job_id}/rerun", response_model=JobStatusResponse)
+async def rerun_stages(
+    job_id: str,
+    payload: RerunRequest,
+    service: JobService = Depends(get_job_service),
+) -> JobStatusResponse:
+    """
+    Re-run alignment, diarization, and/or export from the job's saved ASR output.
+    """
+    try:
+        job = await service.rerun_stages(
+            job_id=job_id,
+            stages=list(dict.fromkeys(payload.stages)),
+            diarization=payload.diarization,
+            alignment_language=payload.alignment_language,
+        )
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail="Job not found") from exc
+    except RuntimeError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return _job_status_response(job, service, service.estimated_start(job.id))
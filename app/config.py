@@ -19,9 +19,16 @@ class Settings(BaseSettings):
     storage_dir: Path = Path("storage")
     uploads_dir: Path = Path("storage/uploads")
     jobs_dir: Path = Path("storage/jobs")
+    # SQLite (WAL) database holding job metadata, events, and segments.
+    jobs_db_path: Path = Path("storage/jobs.db")
+    # Progress updates are coalesced and written at most this often; terminal states are written at once.
+    job_persist_interval_seconds: float = 1.0
+    # Finished jobs kept in memory after being read; older ones are reloaded from the store on demand.
+    job_state_cache_size: int = 256
 
     max_upload_size_mb: int = 2048
     ffmpeg_binary: str = "ffmpeg"
+    ffprobe_binary: str = "ffprobe"
 
     default_model: str = "small"
     default_language: str = "en"
@@ -29,6 +36,48 @@ class Settings(BaseSettings):
     default_device: str = "auto"
     compute_type: str = "float32"
 
+    # Number of jobs processed concurrently, and per-device inference slots.
+    worker_concurrency: int = 1
+    gpu_jobs_per_device: int = 1
+    cpu_job_slots: int = 1
+    # "thread" runs transcription inside the API process; "process" uses warm worker processes.
+    transcription_executor: str = "thread"
+
+    # CPU recordings at least this long are split at pauses and transcribed in parallel (0 disables).
+    long_audio_threshold_seconds: int = 1800
+    long_audio_chunk_seconds: int = 600
+    long_audio_overlap_seconds: float = 2.0
+    long_audio_workers: int = 4
+
+    # Queue ordering: "sjf" (shortest job first) or "fifo"; priority levels apply to both.
+    scheduler_policy: str = "sjf"
+    # Seconds of audio a queued job's cost drops per second waited (SJF aging).
+    scheduler_aging_rate: float = 1.0
+    # A waiting job is promoted one priority level per this many seconds.
+    scheduler_priority_aging_seconds: int = 900
+    scheduler_unknown_duration_seconds: float = 600.0
+    # Initial processing-seconds per audio-second estimate; refined from completed jobs.
+    scheduler_default_realtime_factor: float = 0.5
+
+    # Short queued jobs sharing model settings are transcribed together in one batched pass.
+    batch_max_jobs: int = 8
+    batch_max_job_seconds: float = 120.0
+
+    # Pauses shorter than this are kept when a job asks for silence trimming.
+    trim_silence_min_seconds: float = 1.0
+
+    # Reuse transcripts of byte-identical uploads processed with the same settings.
+    transcript_cache_enabled: bool = True
+    transcript_cache_max_entries: int = 500
+    # Disk budget for rendered exports (keyed by job version, format, and speaker names); 0 keeps only the latest.
+    export_cache_max_mb: int = 512
+
+    # Resident WhisperX model cache budgets; 0 disables caching for that memory pool.
+    model_cache_max_ram_mb: int = 8192
+    model_cache_max_vram_mb: int = 6144
+    # Alignment models and diarization pipelines are dropped after this much idle time.
+    aux_model_cache_idle_seconds: int = 900
+
     whisperx_models: List[str] = Field(
         default_factory=lambda: [
             "tiny",
@@ -9,16 +9,22 @@ from app.core.summary_prompts import default_summary_prompt_templates
 
 
 JobStatus = Literal["queued", "processing", "completed", "failed", "cancelled"]
+JobPriority = Literal["low", "normal", "high"]
+RerunStage = Literal["align", "diarize", "export"]
+JobView = Literal["summary", "full"]
 SummaryStyle = str
 
 
 class JobCreateParams(BaseModel):
     model_name: str = "small"
     language: Optional[str] = "en"
+    # Overrides the alignment model language; defaults to the (detected) transcript language.
+    alignment_language: Optional[str] = None
     batch_size: int = 16
     device: str = "cpu"
     compute_type: str = "float32"
     diarization: bool = True
+    trim_silence: bool = False
     summary_enabled: bool = False
     summary_style: SummaryStyle = "short"
     retain_source_files: bool = True
@@ -26,11 +32,16 @@ class JobCreateParams(BaseModel):
     retain_export_files: bool = True
     output_formats: List[str] = Field(default_factory=lambda: ["txt", "srt", "vtt", "json"])
     speaker_name_overrides: Dict[str, str] = Field(default_factory=dict)
+    priority: JobPriority = "normal"
 
 
 class JobResult(BaseModel):
     transcript: Optional[str] = None
+    # Filled only in API responses; stored jobs keep segments in a per-job artifact.
     segments: List[Dict[str, Any]] = Field(default_factory=list)
+    segment_count: int = 0
+    # Bumped whenever the stored segments are rewritten (e.g. by a stage re-run).
+    segments_revision: int = 0
     language: Optional[str] = None
     summary: Optional[str] = None
     summaries: Dict[str, str] = Field(default_factory=dict)
@@ -43,11 +54,18 @@ class JobState(BaseModel):
     source_path: str
     audio_path: str
     file_type: Literal["audio", "video"]
+    content_hash: Optional[str] = None
+    duration_seconds: Optional[float] = None
     status: JobStatus = "queued"
     progress: int = 0
     step: str = "queued"
     error: Optional[str] = None
     events: List[str] = Field(default_factory=list)
+    # Total events ever pushed; `events` only keeps the most recent ones.
+    event_count: int = 0
+    # Bumped by JobService on every change; drives status ETags and `since=` deltas.
+    version: int = 0
+    completed_stages: List[str] = Field(default_factory=list)
     cancel_requested: bool = False
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -73,6 +91,52 @@ class JobStatusResponse(BaseModel):
     updated_at: datetime
     params: JobCreateParams
     result: JobResult
+    duration_seconds: Optional[float] = None
+    queue_position: Optional[int] = None
+    estimated_start_at: Optional[datetime] = None
+    version: int = 0
+    # Pass back as `since=` to receive only what changed after this response.
+    cursor: Optional[str] = None
+
+
+class JobStatusFields(BaseModel):
+    # `view=summary` or `fields=...`: a subset of `JobStatusResponse`; only requested fields are present.
+    id: str
+    filename: Optional[str] = None
+    file_type: Optional[Literal["audio", "video"]] = None
+    status: Optional[JobStatus] = None
+    progress: Optional[int] = None
+    step: Optional[str] = None
+    error: Optional[str] = None
+    events: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    params: Optional[JobCreateParams] = None
+    result: Optional[JobResult] = None
+    duration_seconds: Optional[float] = None
+    queue_position: Optional[int] = None
+    estimated_start_at: Optional[datetime] = None
+    version: Optional[int] = None
+    cursor: Optional[str] = None
+
+
+class JobChanges(BaseModel):
+    # `since=<cursor>`: light fields plus the events and segments added after the cursor.
+    id: str
+    status: JobStatus
+    progress: int
+    step: str
+    error: Optional[str] = None
+    updated_at: datetime
+    event_count: int
+    events: List[str] = Field(default_factory=list)
+    segment_count: int
+    segments_revision: int
+    # Index of the first entry of `segments`; 0 when segments were rewritten under a new revision.
+    segments_from: int
+    segments: List[Dict[str, Any]] = Field(default_factory=list)
+    version: int
+    cursor: str
 
 
 class SummaryRequest(BaseModel):
@@ -80,6 +144,12 @@ class SummaryRequest(BaseModel):
     speaker_name_overrides: Dict[str, str] = Field(default_factory=dict)
 
 
+class RerunRequest(BaseModel):
+    stages: List[RerunStage] = Field(min_length=1)
+    diarization: Optional[bool] = None
+    alignment_language: Optional[str] = None
+
+
 class QueueControlResponse(BaseModel):
     message: str
 
@@ -96,6 +166,23 @@ class JobListItem(BaseModel):
     updated_at: datetime
 
 
+class JobListPage(BaseModel):
+    items: List[JobListItem]
+    next_cursor: Optional[str] = None
+    # Job totals per status across all jobs, independent of filters and paging.
+    counts: Dict[str, int] = Field(default_factory=dict)
+
+
+class SegmentPage(BaseModel):
+    # Stored segments in time order, each with its `index` in the full transcript.
+    items: List[Dict[str, Any]]
+    # Segments matching the filters across all pages.
+    total: int
+    offset: int
+    next_offset: Optional[int] = None
+    segments_revision: int = 0
+
+
 class GlobalSettings(BaseModel):
     default_model: str = "small"
     default_language: Optional[str] = "en"
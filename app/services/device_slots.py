@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, cast
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceSlots:
+    """
+    Limits how many jobs may run heavy inference on each device at once.
+
+    Every visible CUDA device gets its own `gpu_jobs_per_device` slots, and a GPU job
+    is handed the concrete `cuda:N` it acquired so its models load there. CPU jobs get
+    `cpu_job_slots`, and torch intra-op threads are split evenly between them.
+    """
+
+    def __init__(self) -> None:
+        self.cpu_slots = max(1, settings.cpu_job_slots)
+        self.gpu_jobs_per_device = max(1, settings.gpu_jobs_per_device)
+        self.gpu_count = self._cuda_device_count()
+        self._cpu_semaphore: asyncio.Semaphore | None = None
+        self._gpu_free: asyncio.Condition | None = None
+        self.gpu_active: List[int] = [0] * self.gpu_count
+
+    @staticmethod
+    def _cuda_device_count() -> int:
+        try:
+            import torch
+
+            return max(1, torch.cuda.device_count()) if torch.cuda.is_available() else 1
+        except Exception:
+            return 1
+
+    @staticmethod
+    def device_kind(device: str) -> str:
+        return "cuda" if str(device).startswith("cuda") else "cpu"
+
+    @property
+    def cpu_threads_per_job(self) -> int:
+        return max(1, (os.cpu_count() or 1) // self.cpu_slots)
+
+    def apply_thread_limits(self) -> None:
+        threads = self.cpu_threads_per_job
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except Exception:
+            pass
+        logger.info("CPU job slots: %d, torch threads per job: %d.", self.cpu_slots, threads)
+
+    @staticmethod
+    def device_index(device: str) -> int | None:
+        """The `N` of a `cuda:N` device string, or None when no index is given."""
+        _, _, index = str(device).partition(":")
+        return int(index) if index.isdigit() else None
+
+    def _pick_gpu(self, pinned: int | None) -> int | None:
+        # The least busy device with a free slot; a pinned device waits for itself only.
+        candidates = [pinned] if pinned is not None else range(self.gpu_count)
+        free = [i for i in candidates if self.gpu_active[i] < self.gpu_jobs_per_device]
+        return min(free, key=lambda i: self.gpu_active[i]) if free else None
+
+    @asynccontextmanager
+    async def acquire(self, device: str) -> AsyncIterator[str]:
+        """Hold a slot for `device` and yield the concrete device to run on (`cpu` or `cuda:N`)."""
+        if self.device_kind(device) == "cpu":
+            if self._cpu_semaphore is None:
+                self._cpu_semaphore = asyncio.Semaphore(self.cpu_slots)
+            async with self._cpu_semaphore:
+                yield "cpu"
+            return
+
+        if self._gpu_free is None:
+            self._gpu_free = asyncio.Condition()
+        pinned = self.device_index(device)
+        if pinned is not None and pinned >= self.gpu_count:
+            pinned = None  # not a visible device; schedule it like plain `cuda`
+        async with self._gpu_free:
+            await self._gpu_free.wait_for(lambda: self._pick_gpu(pinned) is not None)
+            index = cast(int, self._pick_gpu(pinned))
+            self.gpu_active[index] += 1
+        try:
+            yield f"cuda:{index}"
+        finally:
+            async with self._gpu_free:
+                self.gpu_active[index] -= 1
+                self._gpu_free.notify_all()
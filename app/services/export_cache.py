@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator
+
+from app.config import settings
+from app.schemas import JobState
+from app.utils.speaker_names import normalize_speaker_name_overrides
+
+
+class ExportCache:
+    """
+    Rendered export files kept on disk for repeat downloads, evicted least recently used.
+
+    Entries are named `<job id>.<job version>.<overrides digest>.<fmt>`. Any job change
+    bumps its version, so an entry can never go stale; older versions of a job are
+    dropped as soon as a newer one is cached. An in-memory index tracks recency and
+    sizes against `export_cache_max_mb`.
+    """
+
+    def __init__(self) -> None:
+        self.path = settings.storage_dir / "cache" / "exports"
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(job: JobState, fmt: str, speaker_name_overrides: Dict[str, str]) -> str:
+        # Normalized so both override directions and key order hit the same entry.
+        normalized = normalize_speaker_name_overrides(speaker_name_overrides)
+        digest = hashlib.sha256(json.dumps(normalized, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return f"{job.id}.{job.version}.{digest[:16]}.{fmt}"
+
+    @property
+    def max_bytes(self) -> int:
+        return max(0, settings.export_cache_max_mb) * 1024 * 1024
+
+    def _load_index(self) -> None:
+        # Caller holds the lock. Rebuild recency from mtimes left by a previous run.
+        if self._loaded:
+            return
+        self._loaded = True
+        entries = []
+        for p in self.path.glob("*"):
+            if p.name.startswith("."):
+                p.unlink(missing_ok=True)  # staging leftovers from an interrupted render
+                continue
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, p.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._bytes += size
+
+    def get(self, key: str) -> Path | None:
+        with self._lock:
+            self._load_index()
+            if key not in self._entries or not (self.path / key).exists():
+                self._forget(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self.path / key
+
+    def staging_path(self, key: str) -> Path:
+        """Unique path to render into before `put`; hidden names are never served."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        fmt = key.rsplit(".", 1)[-1]
+        return self.path / f".{uuid.uuid4().hex}.{fmt}"
+
+    def stream_into(self, key: str, chunks: Iterable[str]) -> Iterator[bytes]:
+        """
+        Pass rendered chunks through as UTF-8 while writing them to the cache. The entry
+        is added only once the render completes; an abandoned stream leaves nothing behind.
+        """
+        staging = self.staging_path(key)
+        try:
+            with staging.open("wb") as f:
+                for chunk in chunks:
+                    data = chunk.encode("utf-8")
+                    f.write(data)
+                    yield data
+            self.put(key, staging)
+        finally:
+            staging.unlink(missing_ok=True)
+
+    def put(self, key: str, rendered: Path) -> Path:
+        """Move a rendered file into the cache under `key` and evict down to the budget."""
+        target = self.path / key
+        job_id, version = key.split(".", 2)[:2]
+        with self._lock:
+            self._load_index()
+            os.replace(rendered, target)
+            self._forget(key)
+            size = target.stat().st_size
+            self._entries[key] = size
+            self._bytes += size
+            for name in [n for n in self._entries if n.startswith(f"{job_id}.") and n.split(".", 2)[1] != version]:
+                self._remove(name)
+            # The newest entry always stays, so it can be served even when larger than the budget.
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return target
+
+    def discard_job(self, job_id: str) -> None:
+        with self._lock:
+            self._load_index()
+            for name in [n for n in self._entries if n.startswith(f"{job_id}.")]:
+                self._remove(name)
+
+    def _forget(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key, 0)
+
+    def _remove(self, key: str) -> None:
+        self._forget(key)
+        (self.path / key).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "used_mb": round(self._bytes / (1024 * 1024), 2),
+                "budget_mb": settings.export_cache_max_mb,
+            }
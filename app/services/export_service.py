@@ -2,12 +2,37 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List
 
-from app.utils.speaker_names import apply_speaker_name_overrides
+from app.utils.speaker_names import iter_speaker_name_overrides
+
+# Rendered pieces are joined into chunks of about this many characters before being yielded.
+EXPORT_CHUNK_CHARS = 64 * 1024
+
+
+def _chunked(pieces: Iterable[str], size: int = EXPORT_CHUNK_CHARS) -> Iterator[str]:
+    buffer: List[str] = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield "".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer)
 
 
 class ExportService:
+    def __init__(self) -> None:
+        self._renderers: Dict[str, Callable[[dict, Iterable[Dict[str, Any]]], Iterator[str]]] = {
+            "txt": self._render_txt,
+            "json": self._render_json,
+            "srt": self._render_srt,
+            "vtt": self._render_vtt,
+            "tsv": self._render_tsv,
+        }
+
     def _fmt_time(self, seconds: float, srt: bool = False) -> str:
         ms = int((seconds % 1) * 1000)
         total_seconds = int(seconds)
@@ -17,6 +42,23 @@ class ExportService:
         sep = "," if srt else "."
         return f"{hrs:02d}:{mins:02d}:{secs:02d}{sep}{ms:03d}"
 
+    def render(
+        self,
+        fmt: str,
+        result: dict,
+        speaker_name_overrides: Dict[str, str] | None = None,
+    ) -> Iterator[str]:
+        """
+        Render one export format as a stream of text chunks.
+
+        Segments are read one at a time, so memory stays flat for any transcript
+        length when `result["segments"]` is a lazy sequence such as a segment artifact.
+        """
+        if fmt not in self._renderers:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        segments = iter_speaker_name_overrides(result.get("segments", []), speaker_name_overrides)
+        return _chunked(self._renderers[fmt](result, segments))
+
     def write_outputs(
         self,
         job_dir: Path,
@@ -26,62 +68,72 @@ class ExportService:
         speaker_name_overrides: Dict[str, str] | None = None,
     ) -> Dict[str, str]:
         files: Dict[str, str] = {}
-        segments = result.get("segments", [])
-        text = result.get("text", "").strip()
-        if not text and segments:
-            text = " ".join((seg.get("text", "").strip() for seg in segments)).strip()
-
-        # Apply speaker name overrides if provided
-        if speaker_name_overrides:
-            segments = apply_speaker_name_overrides(segments, speaker_name_overrides)
-
-        if "txt" in output_formats:
-            p = job_dir / f"{base_name}.txt"
-            p.write_text(text + "\n", encoding="utf-8")
-            files["txt"] = str(p)
-
-        if "json" in output_formats:
-            # Create a copy of result with overridden segments for JSON export
-            export_result = dict(result)
-            export_result["segments"] = segments
-            p = job_dir / f"{base_name}.json"
-            p.write_text(json.dumps(export_result, ensure_ascii=False, indent=2), encoding="utf-8")
-            files["json"] = str(p)
-
-        if "srt" in output_formats:
-            p = job_dir / f"{base_name}.srt"
+        for fmt in self._renderers:
+            if fmt not in output_formats:
+                continue
+            p = job_dir / f"{base_name}.{fmt}"
             with p.open("w", encoding="utf-8") as f:
-                for i, seg in enumerate(segments, start=1):
-                    speaker = seg.get("speaker")
-                    prefix = f"[{speaker}] " if speaker else ""
-                    line = seg.get("text", "").strip()
-                    f.write(f"{i}\n")
-                    f.write(
-                        f"{self._fmt_time(seg.get('start', 0), srt=True)} --> {self._fmt_time(seg.get('end', 0), srt=True)}\n"
-                    )
-                    f.write(f"{prefix}{line}\n\n")
-            files["srt"] = str(p)
-
-        if "vtt" in output_formats:
-            p = job_dir / f"{base_name}.vtt"
-            with p.open("w", encoding="utf-8") as f:
-                f.write("WEBVTT\n\n")
-                for seg in segments:
-                    speaker = seg.get("speaker")
-                    prefix = f"[{speaker}] " if speaker else ""
-                    line = seg.get("text", "").strip()
-                    f.write(f"{self._fmt_time(seg.get('start', 0))} --> {self._fmt_time(seg.get('end', 0))}\n")
-                    f.write(f"{prefix}{line}\n\n")
-            files["vtt"] = str(p)
-
-        if "tsv" in output_formats:
-            p = job_dir / f"{base_name}.tsv"
-            with p.open("w", encoding="utf-8") as f:
-                f.write("start\tend\tspeaker\ttext\n")
-                for seg in segments:
-                    f.write(
-                        f"{seg.get('start', 0):.3f}\t{seg.get('end', 0):.3f}\t{seg.get('speaker', '')}\t{seg.get('text', '').strip()}\n"
-                    )
-            files["tsv"] = str(p)
-
+                for chunk in self.render(fmt, result, speaker_name_overrides):
+                    f.write(chunk)
+            files[fmt] = str(p)
         return files
+
+    def _render_txt(self, result: dict, segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        # Speaker names do not appear in plain text, so the raw segments are used.
+        text = result.get("text", "").strip()
+        if text or not result.get("segments"):
+            yield text + "\n"
+            return
+        # Same output as " ".join(stripped segment texts).strip(), without building it.
+        started = False
+        pending_separators = 0
+        for seg in result["segments"]:
+            line = seg.get("text", "").strip()
+            if started:
+                pending_separators += 1
+            if line:
+                yield " " * pending_separators + line
+                started = True
+                pending_separators = 0
+        yield "\n"
+
+    def _render_json(self, result: dict, segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        # Matches json.dumps(result, ensure_ascii=False, indent=2) with overridden segments.
+        keys = [*result, *(["segments"] if "segments" not in result else [])]
+        yield "{"
+        for index, key in enumerate(keys):
+            yield ("," if index else "") + "\n  " + json.dumps(key, ensure_ascii=False) + ": "
+            if key != "segments":
+                yield json.dumps(result[key], ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                continue
+            empty = True
+            for seg in segments:
+                yield ("[" if empty else ",") + "\n    "
+                yield json.dumps(seg, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+                empty = False
+            yield "[]" if empty else "\n  ]"
+        yield "\n}"
+
+    def _render_srt(self, result: dict, segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        for i, seg in enumerate(segments, start=1):
+            speaker = seg.get("speaker")
+            prefix = f"[{speaker}] " if speaker else ""
+            line = seg.get("text", "").strip()
+            yield (
+                f"{i}\n"
+                f"{self._fmt_time(seg.get('start', 0), srt=True)} --> {self._fmt_time(seg.get('end', 0), srt=True)}\n"
+                f"{prefix}{line}\n\n"
+            )
+
+    def _render_vtt(self, result: dict, segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        yield "WEBVTT\n\n"
+        for seg in segments:
+            speaker = seg.get("speaker")
+            prefix = f"[{speaker}] " if speaker else ""
+            line = seg.get("text", "").strip()
+            yield f"{self._fmt_time(seg.get('start', 0))} --> {self._fmt_time(seg.get('end', 0))}\n{prefix}{line}\n\n"
+
+    def _render_tsv(self, result: dict, segments: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        yield "start\tend\tspeaker\ttext\n"
+        for seg in segments:
+            yield f"{seg.get('start', 0):.3f}\t{seg.get('end', 0):.3f}\t{seg.get('speaker', '')}\t{seg.get('text', '').strip()}\n"
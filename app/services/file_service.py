@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import asyncio
+import hashlib
+import json
 import subprocess
 from pathlib import Path
 from typing import Literal
@@ -12,47 +13,42 @@ from app.utils.media import detect_media_type
 
 
 class FileService:
-    async def save_upload(self, file: UploadFile, destination: Path) -> None:
+    async def save_upload(self, file: UploadFile, destination: Path) -> str:
+        """Stream the upload to disk and return the SHA-256 hex digest of its content."""
         destination.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
         with destination.open("wb") as out:
             while True:
                 chunk = await file.read(1024 * 1024)
                 if not chunk:
                     break
+                digest.update(chunk)
                 out.write(chunk)
+        return digest.hexdigest()
 
     def get_media_type(self, path: Path) -> Literal["audio", "video"]:
         return detect_media_type(path)
 
-    async def ensure_audio_mp3(
-        self,
-        source_path: Path,
-        job_dir: Path,
-        media_type: Literal["audio", "video"],
-    ) -> Path:
-        if media_type == "audio":
-            return source_path
-        target = job_dir / "input.mp3"
-        await asyncio.to_thread(self._convert_video_to_mp3, source_path, target)
-        return target
-
-    def _convert_video_to_mp3(self, src: Path, target: Path) -> None:
+    def probe_duration(self, path: Path) -> float | None:
+        """Container duration in seconds from ffprobe, or None when it is unavailable or unknown."""
         cmd = [
-            settings.ffmpeg_binary,
-            "-y",
-            "-i",
-            str(src),
-            "-vn",
-            "-acodec",
-            "libmp3lame",
-            "-ar",
-            "44100",
-            "-ac",
-            "2",
-            "-b:a",
-            "192k",
-            str(target),
+            settings.ffprobe_binary,
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "json",
+            str(path),
         ]
-        proc = subprocess.run(cmd, check=False, capture_output=True, text=True)
+        try:
+            proc = subprocess.run(cmd, check=False, capture_output=True, text=True)
+        except OSError:
+            return None
         if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg conversion failed: {proc.stderr}")
+            return None
+        try:
+            duration = (json.loads(proc.stdout or "{}").get("format") or {}).get("duration")
+            return float(duration) if duration not in (None, "N/A") else None
+        except (json.JSONDecodeError, ValueError):
+            return None
@@ -2,35 +2,80 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import shutil
+import threading
+import time
 import uuid
+from collections import Counter, OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence
 
 from fastapi import UploadFile
 
 from app.config import settings
-from app.schemas import JobCreateParams, JobListItem, JobState
+from app.schemas import JobCreateParams, JobListItem, JobListPage, JobState, SegmentPage
+from app.services.device_slots import DeviceSlots
+from app.services.export_cache import ExportCache
 from app.services.export_service import ExportService
 from app.services.file_service import FileService
 from app.services.global_settings_service import GlobalSettingsService
+from app.services.job_store import MAX_EVENTS_PER_JOB, JobStore
+from app.services.job_updates import JobUpdateBus
+from app.services.model_cache import evict_idle_models
+from app.services.scheduler import PRIORITY_LEVELS, JobScheduler
 from app.services.summarization_service import SummarizationService
-from app.services.transcription_service import TranscriptionService
+from app.services.transcript_cache import TranscriptCache
+from app.services.transcription_service import TranscriptionService, reserve_chunk_worker_budgets
+from app.services.transcription_workers import TranscriptionWorkerPool
+from app.utils.audio import WAVEFORM_FILENAME
+from app.utils.checkpoints import CHECKPOINT_DIRNAME, StageCheckpoints
+from app.utils.segments import SEGMENTS_DIRNAME, SegmentArtifact, load_segments, select_segments, write_segments
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+# Opened segment artifacts kept for repeat reads, keyed by job and segments revision.
+_SEGMENT_ARTIFACT_CACHE_SIZE = 32
 
 
 class JobService:
     def __init__(self) -> None:
+        self.device_slots = DeviceSlots()
         self.file_service = FileService()
-        self.transcription_service = TranscriptionService()
+        self.transcription_service = TranscriptionService(cpu_threads=self.device_slots.cpu_threads_per_job)
         self.export_service = ExportService()
         self.summarization_service = SummarizationService()
         self.global_settings_service = GlobalSettingsService()
+        self.transcript_cache = TranscriptCache()
+        self.export_cache = ExportCache()
+        self.store = JobStore(settings.jobs_db_path)
+        self.updates = JobUpdateBus()
 
-        self.jobs: Dict[str, JobState] = {}
-        self.queue: asyncio.Queue[str] = asyncio.Queue()
-        self.worker_task: asyncio.Task | None = None
-        self.current_job_id: str | None = None
+        # Resident job states: every queued/processing job, plus an LRU of recently read finished ones.
+        # The full history lives in the store and is loaded on demand.
+        self.jobs: OrderedDict[str, JobState] = OrderedDict()
+        self._pinned_job_ids: set[str] = set()
+        self.scheduler = JobScheduler()
+        self.worker_tasks: List[asyncio.Task] = []
+        self.cache_sweeper_task: asyncio.Task | None = None
+        self.persist_task: asyncio.Task | None = None
+        # Jobs changed since the last write-behind flush; touched from worker threads too.
+        self._dirty_job_ids: set[str] = set()
+        self._dirty_lock = threading.Lock()
+        # Job totals per status, kept current by `_save_job` so listing never scans the table.
+        # `_counted_status` is the status each resident job is counted under; guarded by `_dirty_lock`.
+        self._status_counts: Counter[str] = Counter(self.store.count_by_status())
+        self._counted_status: Dict[str, str] = {}
+        self.active_job_ids: set[str] = set()
+        # Members of the batched ASR pass currently running, by job id. The pass runs under the
+        # first member's id, so a member's cancel is routed through its batch.
+        self._running_batches: Dict[str, List[JobState]] = {}
+        self._segment_artifacts: OrderedDict[tuple[str, int], SegmentArtifact] = OrderedDict()
+        self._segment_artifacts_lock = threading.Lock()
+        self.worker_pool: TranscriptionWorkerPool | None = None
+        self._stopping = False
 
     @staticmethod
     def _utcnow() -> datetime:
@@ -43,17 +88,79 @@ class JobService:
         return value.astimezone(timezone.utc)
 
     async def start_worker(self) -> None:
-        self._load_jobs_from_disk()
-        if self.worker_task is None:
-            self.worker_task = asyncio.create_task(self._worker(), name="whisperx-worker")
+        self._stopping = False
+        resumable = self._load_jobs_from_disk()
+        for job in sorted(resumable, key=lambda j: j.created_at):
+            await self._enqueue(job)
+        if not self.worker_tasks:
+            self.device_slots.apply_thread_limits()
+            if settings.transcription_executor == "process" and self.worker_pool is None:
+                self.worker_pool = TranscriptionWorkerPool(
+                    size=settings.worker_concurrency,
+                    cpu_threads=self.device_slots.cpu_threads_per_job,
+                    warm_params=self._warm_up_params(),
+                )
+                await asyncio.to_thread(self.worker_pool.start)
+            else:
+                # Transcription runs in this process, so its long-audio chunk pool does too.
+                reserve_chunk_worker_budgets()
+            self.worker_tasks = [
+                asyncio.create_task(self._worker(), name=f"whisperx-worker-{i}")
+                for i in range(max(1, settings.worker_concurrency))
+            ]
+        if self.cache_sweeper_task is None:
+            self.cache_sweeper_task = asyncio.create_task(self._cache_sweeper(), name="model-cache-sweeper")
+        if self.persist_task is None:
+            self.persist_task = asyncio.create_task(self._persist_loop(), name="job-persistence")
 
     async def stop_worker(self) -> None:
-        if self.worker_task:
-            self.worker_task.cancel()
+        # Jobs interrupted from here on stay resumable instead of being marked cancelled.
+        self._stopping = True
+        for task in (*self.worker_tasks, self.cache_sweeper_task, self.persist_task):
+            if not task:
+                continue
+            task.cancel()
             try:
-                await self.worker_task
+                await task
             except asyncio.CancelledError:
                 pass
+        if self.worker_pool:
+            await asyncio.to_thread(self.worker_pool.shutdown)
+            self.worker_pool = None
+        self.persist_task = None
+        # Interrupted jobs were marked dirty while their tasks unwound; persist them before closing.
+        self._flush_dirty_jobs()
+        self.store.close()
+
+    def _warm_up_params(self) -> JobCreateParams:
+        global_settings = self.global_settings_service.get()
+        return JobCreateParams(
+            model_name=global_settings.default_model,
+            language=global_settings.default_language,
+            device=global_settings.default_device,
+            compute_type=global_settings.compute_type,
+        )
+
+    async def _run_transcription(
+        self,
+        job: JobState,
+        method: str,
+        *args: Any,
+        progress_cb: Any = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run a TranscriptionService method in a worker process or a thread, per settings."""
+        if self.worker_pool:
+            return await asyncio.to_thread(self.worker_pool.run, job.id, method, args, kwargs, progress_cb)
+        return await asyncio.to_thread(
+            getattr(self.transcription_service, method), *args, progress_cb=progress_cb, **kwargs
+        )
+
+    async def _cache_sweeper(self) -> None:
+        interval = max(10, min(60, settings.aux_model_cache_idle_seconds // 4 or 60))
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(evict_idle_models)
 
     async def create_job(self, file: UploadFile, params: JobCreateParams) -> str:
         job_id = str(uuid.uuid4())
@@ -62,60 +169,301 @@ class JobService:
 
         source_name = Path(file.filename or "input.bin").name
         source_path = job_dir / source_name
-        await self.file_service.save_upload(file, source_path)
+        content_hash = await self.file_service.save_upload(file, source_path)
 
         media_type = self.file_service.get_media_type(source_path)
-        audio_path = await self.file_service.ensure_audio_mp3(source_path, job_dir, media_type)
+        cache_key = self.transcript_cache.key_for(content_hash, params)
+        # Read the entry once and hand it over: a second lookup could race a prune and end up
+        # transcribing inside this request.
+        cached = None if params.summary_enabled else await asyncio.to_thread(self.transcript_cache.get, cache_key)
+        # Only the duration is needed up front (for scheduling); decoding happens in the worker.
+        duration = await asyncio.to_thread(self.file_service.probe_duration, source_path)
 
         state = JobState(
             id=job_id,
             filename=source_name,
             source_path=str(source_path),
-            audio_path=str(audio_path),
+            audio_path=str(source_path),
             file_type=media_type,
+            content_hash=content_hash,
+            duration_seconds=duration,
             params=params,
         )
         self._push_event(state, "Job queued.")
         self.jobs[job_id] = state
-        self._save_job(state)
-        await self.queue.put(job_id)
+        self._save_job(state, flush=True)
+
+        if cached is not None:
+            # Nothing heavy left to do: finish inline instead of waiting behind the queue.
+            await self._process_job(job_id, cached_result=cached)
+        else:
+            await self._enqueue(state)
         return job_id
 
+    async def _enqueue(self, job: JobState) -> None:
+        await self.scheduler.put(
+            job.id,
+            priority=PRIORITY_LEVELS.get(job.params.priority, PRIORITY_LEVELS["normal"]),
+            duration_seconds=job.duration_seconds,
+        )
+
+    def queue_position(self, job_id: str) -> int | None:
+        return self.scheduler.position(job_id)
+
+    def estimated_start(self, job_id: str) -> datetime | None:
+        if job_id not in self.scheduler:
+            return None
+        remaining = []
+        for active_id in self.active_job_ids:
+            active = self.jobs.get(active_id)
+            if not active:
+                continue
+            total = self.scheduler.estimated_processing_seconds(active.duration_seconds)
+            remaining.append(total * max(0.0, 1 - active.progress / 100))
+        estimate = self.scheduler.estimate_start(job_id, remaining, max(1, settings.worker_concurrency))
+        # Whole seconds, so a queued job's status ETag changes at most once a second.
+        return estimate.replace(microsecond=0) if estimate else None
+
     def get_job(self, job_id: str) -> JobState:
         job = self.jobs.get(job_id)
-        if not job:
+        if job is not None:
+            self.jobs.move_to_end(job_id)
+            return job
+        job = self.store.load(job_id)
+        if job is None:
             raise KeyError("Job not found")
+        self._adopt(job)
         return job
 
-    def list_jobs(self) -> List[JobListItem]:
-        for job in self.jobs.values():
-            job.created_at = self._ensure_aware_utc(job.created_at)
-            job.updated_at = self._ensure_aware_utc(job.updated_at)
-        jobs = sorted(self.jobs.values(), key=lambda j: j.updated_at, reverse=True)
-        return [
-            JobListItem(
-                id=j.id,
-                filename=j.filename,
-                file_type=j.file_type,
-                status=j.status,
-                progress=j.progress,
-                step=j.step,
-                error=j.error,
-                created_at=j.created_at,
-                updated_at=j.updated_at,
-            )
-            for j in jobs
+    def _adopt(self, job: JobState) -> None:
+        """Make a job loaded from the store resident."""
+        job.created_at = self._ensure_aware_utc(job.created_at)
+        job.updated_at = self._ensure_aware_utc(job.updated_at)
+        with self._dirty_lock:
+            self._counted_status[job.id] = job.status
+        self.jobs[job.id] = job
+        self._evict_resident_jobs()
+
+    def _evict_resident_jobs(self) -> None:
+        limit = max(0, settings.job_state_cache_size)
+        evictable = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.status in _TERMINAL_STATUSES
+            and job_id not in self.active_job_ids
+            and job_id not in self._pinned_job_ids
+            and job_id not in self._dirty_job_ids
         ]
+        # Oldest first, thanks to move_to_end on every read.
+        for job_id in evictable[: max(0, len(evictable) - limit)]:
+            self.jobs.pop(job_id, None)
+            with self._dirty_lock:
+                self._counted_status.pop(job_id, None)
+
+    @staticmethod
+    def list_item(job: JobState) -> JobListItem:
+        return JobListItem(
+            id=job.id,
+            filename=job.filename,
+            file_type=job.file_type,
+            status=job.status,
+            progress=job.progress,
+            step=job.step,
+            error=job.error,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
+
+    def job_changes(
+        self,
+        job: JobState,
+        events_after: int = 0,
+        segments_revision: int | None = None,
+        segments_after: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Light job fields plus the events and segments added after the given cursors.
+
+        `events_after` is an `event_count` the caller has already seen. Segments are
+        addressed by `(segments_revision, segments_after)`; a re-run rewrites segments
+        under a new revision, in which case they are all sent again from index 0.
+        """
+        retained = len(job.events)
+        new_event_count = min(retained, max(0, job.event_count - events_after))
+        segments_from = segments_after if segments_revision == job.result.segments_revision else 0
+        new_segments: List[Dict[str, Any]] = []
+        if job.result.segment_count > segments_from:
+            new_segments = list(self.segments(job)[segments_from:])
+        return {
+            "id": job.id,
+            "status": job.status,
+            "progress": job.progress,
+            "step": job.step,
+            "error": job.error,
+            "updated_at": job.updated_at.isoformat(),
+            "event_count": job.event_count,
+            "events": job.events[retained - new_event_count :],
+            "segment_count": job.result.segment_count,
+            "segments_revision": job.result.segments_revision,
+            "segments_from": segments_from,
+            "segments": new_segments,
+            "version": job.version,
+            "cursor": self.change_cursor(job),
+        }
+
+    @staticmethod
+    def change_cursor(job: JobState) -> str:
+        return f"{job.version}.{job.event_count}.{job.result.segments_revision}.{job.result.segment_count}"
+
+    def job_delta(self, job: JobState, since: str) -> Dict[str, Any]:
+        """`job_changes` after a cursor from an earlier response; raises ValueError for a malformed cursor."""
+        try:
+            _version, events_after, segments_revision, segments_after = (int(part) for part in since.split("."))
+        except ValueError:
+            raise ValueError("Invalid since cursor") from None
+        return self.job_changes(job, events_after, segments_revision, segments_after)
+
+    def etag(self, job: JobState, estimated_start_at: datetime | None = None) -> str:
+        # Queue position and start estimate move as other jobs progress, without this job changing.
+        position = self.queue_position(job.id)
+        suffix = f"-q{position}" if position is not None else ""
+        if estimated_start_at is not None:
+            suffix += f"-s{int(estimated_start_at.timestamp())}"
+        return f'W/"{job.version}{suffix}"'
+
+    def list_jobs(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        statuses: List[str] | None = None,
+        filename: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> JobListPage:
+        # Coalesced progress not yet flushed is merged into the page instead of forcing a write.
+        with self._dirty_lock:
+            pending = [self.jobs[job_id] for job_id in self._dirty_job_ids if job_id in self.jobs]
+            counts = {status: count for status, count in self._status_counts.items() if count > 0}
+        rows, next_cursor = self.store.list_page(
+            limit=limit,
+            cursor=cursor,
+            statuses=statuses,
+            filename=filename,
+            created_from=created_from,
+            created_to=created_to,
+            pending=[self.list_item(job).model_dump(mode="json") for job in pending],
+        )
+        return JobListPage(
+            items=[JobListItem.model_validate(row) for row in rows],
+            next_cursor=next_cursor,
+            counts=counts,
+        )
 
     async def _worker(self) -> None:
         while True:
-            job_id = await self.queue.get()
-            try:
+            job_id = await self.scheduler.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != "queued":
+                continue
+            batch = self._claim_batch(job)
+            if len(batch) > 1:
+                await self._process_batch(batch)
+            else:
                 await self._process_job(job_id)
-            finally:
-                self.queue.task_done()
 
-    async def _process_job(self, job_id: str, speaker_name_overrides: Dict[str, str] | None = None) -> None:
+    def _batch_key(self, job: JobState) -> tuple | None:
+        if settings.batch_max_jobs <= 1 or job.cancel_requested:
+            return None
+        if job.duration_seconds is None or job.duration_seconds > settings.batch_max_job_seconds:
+            return None
+        params = job.params
+        # Auto-detected language and silence trimming are per-recording decisions.
+        if not params.language or params.trim_silence:
+            return None
+        # Resumed and re-run jobs already have their own ASR checkpoint.
+        if self._checkpoint_dir(job.id).exists():
+            return None
+        if job.content_hash and self.transcript_cache.contains(
+            self.transcript_cache.key_for(job.content_hash, params)
+        ):
+            return None
+        return (params.model_name, params.language, params.compute_type, params.device, params.batch_size)
+
+    def _claim_batch(self, job: JobState) -> List[JobState]:
+        key = self._batch_key(job)
+        if key is None:
+            return [job]
+        companion_ids = self.scheduler.take_matching(
+            lambda other_id: other_id in self.jobs
+            and self.jobs[other_id].status == "queued"
+            and self._batch_key(self.jobs[other_id]) == key,
+            settings.batch_max_jobs - 1,
+        )
+        batch = [job, *(self.jobs[other_id] for other_id in companion_ids)]
+        for member in batch:
+            member.status = "processing"
+            member.step = "batched"
+        return batch
+
+    async def _process_batch(self, batch: List[JobState]) -> None:
+        lead = batch[0]
+        for job in batch:
+            self.active_job_ids.add(job.id)
+            self._running_batches[job.id] = batch
+            job.progress = 10
+            job.updated_at = self._utcnow()
+            self._push_event(job, f"Batched with {len(batch) - 1} other short recording(s).")
+            self._save_job(job)
+
+        def _progress_cb(progress: int, step: str, event: str) -> None:
+            # Cancelled members are dropped from the split afterwards; only abort when nobody is left.
+            if all(job.cancel_requested for job in batch):
+                raise asyncio.CancelledError("Cancellation requested by user.")
+            for job in batch:
+                if job.cancel_requested:
+                    continue
+                job.progress = progress
+                job.step = step
+                job.updated_at = self._utcnow()
+                self._push_event(job, event)
+                self._save_job(job)
+
+        asr_results: List[Dict[str, Any]] | None = None
+        try:
+            async with self.device_slots.acquire(self._job_device(lead)) as device:
+                asr_results = await self._run_transcription(
+                    lead,
+                    "transcribe_batch",
+                    [Path(job.audio_path) for job in batch],
+                    lead.params,
+                    progress_cb=_progress_cb,
+                    waveform_paths=[self._waveform_path(job.id) for job in batch],
+                    device=device,
+                )
+        except (Exception, asyncio.CancelledError) as exc:
+            task = asyncio.current_task()
+            if isinstance(exc, asyncio.CancelledError) and task is not None and task.cancelling():
+                raise
+            # Every member was cancelled or the pass failed: run each member on its own instead.
+            for job in batch:
+                if not job.cancel_requested:
+                    self._push_event(job, "Batched transcription interrupted; processing individually.")
+        finally:
+            for job in batch:
+                self.active_job_ids.discard(job.id)
+                self._running_batches.pop(job.id, None)
+
+        for index, job in enumerate(batch):
+            job.status = "queued"
+            await self._process_job(job.id, asr_result=asr_results[index] if asr_results else None)
+
+    async def _process_job(
+        self,
+        job_id: str,
+        speaker_name_overrides: Dict[str, str] | None = None,
+        asr_result: Dict[str, Any] | None = None,
+        cached_result: Dict[str, Any] | None = None,
+    ) -> None:
         job = self.get_job(job_id)
         if job.status == "cancelled":
             return
@@ -123,7 +471,7 @@ class JobService:
             self._mark_cancelled(job, "Cancelled before processing started.")
             return
 
-        self.current_job_id = job_id
+        self.active_job_ids.add(job_id)
         job.status = "processing"
         job.progress = 10
         job.step = "preparing"
@@ -149,13 +497,41 @@ class JobService:
                 self._push_event(job, event)
                 self._save_job(job)
 
-            result = await asyncio.to_thread(
-                self.transcription_service.transcribe,
-                Path(job.audio_path),
-                job.params,
-                _progress_cb,
-                global_settings.hf_token,
-            )
+            cache_key = self.transcript_cache.key_for(job.content_hash, job.params) if job.content_hash else None
+            result: Dict[str, Any] | None = cached_result
+            if result is not None:
+                self._push_event(job, "Cache hit: reusing transcript of an identical upload.")
+            elif "transcribe" in job.completed_stages and job.result.segment_count:
+                result = {
+                    "text": job.result.transcript or "",
+                    "segments": list(self.segments(job)),
+                    "language": job.result.language,
+                }
+                self._push_event(job, "Resuming: transcript already complete.")
+            elif cache_key and not self._checkpoint_dir(job.id).exists():
+                # Jobs with their own checkpoints (resumed or re-run) rebuild from those instead.
+                result = self.transcript_cache.get(cache_key)
+                if result is not None:
+                    self._push_event(job, "Cache hit: reusing transcript of an identical upload.")
+            if result is None:
+                async with self.device_slots.acquire(self._job_device(job)) as device:
+                    started = time.monotonic()
+                    result = await self._run_transcription(
+                        job,
+                        "transcribe",
+                        Path(job.audio_path),
+                        job.params,
+                        progress_cb=_progress_cb,
+                        hf_token=global_settings.hf_token,
+                        waveform_path=self._waveform_path(job.id),
+                        asr_result=asr_result,
+                        checkpoint_dir=self._checkpoint_dir(job.id),
+                        device=device,
+                    )
+                if asr_result is None:
+                    self.scheduler.record_completion(job.duration_seconds, time.monotonic() - started)
+                if cache_key and self._is_cacheable(job, result):
+                    await asyncio.to_thread(self.transcript_cache.put, cache_key, result, job.id)
 
             job.progress = 70
             job.step = "exporting"
@@ -164,22 +540,24 @@ class JobService:
             self._save_job(job)
 
             job.result.transcript = result.get("text", "")
-            job.result.segments = result.get("segments", [])
+            await asyncio.to_thread(self._store_segments, job, result.get("segments", []))
             job.result.language = result.get("language")
+            self._complete_stage(job, "transcribe")
             if job.cancel_requested:
                 raise asyncio.CancelledError("Cancellation requested by user.")
 
-            outputs = self.export_service.write_outputs(
-                job_dir=Path(job.source_path).parent,
-                base_name="transcript",
-                result=result,
-                output_formats=job.params.output_formats,
-                speaker_name_overrides=effective_overrides,
-            )
-            job.result.generated_files = outputs
-            self._save_job(job)
+            if not self._export_is_current(job):
+                outputs = self.export_service.write_outputs(
+                    job_dir=self._job_dir(job.id),
+                    base_name="transcript",
+                    result=result,
+                    output_formats=job.params.output_formats,
+                    speaker_name_overrides=effective_overrides,
+                )
+                job.result.generated_files = outputs
+            self._complete_stage(job, "export")
 
-            if job.params.summary_enabled:
+            if job.params.summary_enabled and "summary" not in job.completed_stages:
                 job.progress = 85
                 job.step = "summarizing"
                 job.updated_at = self._utcnow()
@@ -193,11 +571,12 @@ class JobService:
                     global_settings.llm_api_base,
                     global_settings.llm_api_key,
                     global_settings.llm_model,
-                    segments=job.result.segments,
+                    segments=result.get("segments", []),
                     speaker_name_overrides=effective_overrides,
                 )
                 job.result.summary = summary
                 job.result.summaries[job.params.summary_style] = summary
+                self._complete_stage(job, "summary")
 
             job.status = "completed"
             job.progress = 100
@@ -208,7 +587,12 @@ class JobService:
             self._save_job(job)
 
         except asyncio.CancelledError:
-            self._mark_cancelled(job, "Cancelled by user.")
+            if not self._stopping:
+                self._mark_cancelled(job, "Cancelled by user.")
+                return
+            self._push_event(job, "Interrupted by shutdown; will resume on restart.")
+            self._save_job(job)
+            raise
         except Exception as exc:
             job.status = "failed"
             job.progress = 100
@@ -219,8 +603,33 @@ class JobService:
             self._push_event(job, f"Failed: {job.error}")
             self._save_job(job)
         finally:
-            if self.current_job_id == job_id:
-                self.current_job_id = None
+            self.active_job_ids.discard(job_id)
+
+    def _complete_stage(self, job: JobState, stage: str) -> None:
+        if stage not in job.completed_stages:
+            job.completed_stages.append(stage)
+        self._save_job(job)
+
+    @staticmethod
+    def _export_is_current(job: JobState) -> bool:
+        if "export" not in job.completed_stages:
+            return False
+        files = job.result.generated_files
+        return all(fmt in files and Path(files[fmt]).exists() for fmt in job.params.output_formats)
+
+    @staticmethod
+    def _is_cacheable(job: JobState, result: Dict[str, Any]) -> bool:
+        # A diarized job whose diarization failed at runtime must not poison the diarized key.
+        if job.params.diarization:
+            return any(seg.get("speaker") for seg in result.get("segments", []))
+        return True
+
+    def _job_device(self, job: JobState) -> str:
+        try:
+            return self.transcription_service._resolve_device(job.params.device or settings.default_device)
+        except RuntimeError:
+            # Let transcription surface the device error; just pick a slot pool.
+            return job.params.device
 
     @staticmethod
     def _push_event(job: JobState, message: str) -> None:
@@ -228,36 +637,173 @@ class JobService:
         entry = f"[{ts}] {message}"
         if not job.events or job.events[-1] != entry:
             job.events.append(entry)
-        if len(job.events) > 120:
-            job.events = job.events[-120:]
+            job.event_count += 1
+        if len(job.events) > MAX_EVENTS_PER_JOB:
+            job.events = job.events[-MAX_EVENTS_PER_JOB:]
 
-    def _job_json_path(self, job_id: str) -> Path:
-        return settings.jobs_dir / job_id / "job.json"
+    def _job_dir(self, job_id: str) -> Path:
+        return settings.jobs_dir / job_id
 
-    def _save_job(self, job: JobState) -> None:
-        p = self._job_json_path(job.id)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(json.dumps(job.model_dump(mode="json"), ensure_ascii=False, indent=2), encoding="utf-8")
+    def _waveform_path(self, job_id: str) -> Path:
+        return self._job_dir(job_id) / WAVEFORM_FILENAME
 
-    def _load_jobs_from_disk(self) -> None:
-        self.jobs.clear()
-        settings.jobs_dir.mkdir(parents=True, exist_ok=True)
+    def _checkpoint_dir(self, job_id: str) -> Path:
+        return self._job_dir(job_id) / CHECKPOINT_DIRNAME
+
+    def _segments_dir(self, job_id: str) -> Path:
+        return self._job_dir(job_id) / SEGMENTS_DIRNAME
+
+    def segments(self, job: JobState) -> Sequence[Dict[str, Any]]:
+        """The job's transcript segments, memory-mapped from its segment artifact on access."""
+        if not job.result.segment_count:
+            return []
+        # A rewrite bumps the revision, so an opened artifact never serves stale segments.
+        key = (job.id, job.result.segments_revision)
+        with self._segment_artifacts_lock:
+            artifact = self._segment_artifacts.get(key)
+            if artifact is not None:
+                self._segment_artifacts.move_to_end(key)
+                return artifact
+        artifact = load_segments(self._segments_dir(job.id))
+        if artifact is None:
+            return []
+        with self._segment_artifacts_lock:
+            self._discard_segment_artifacts(job.id)
+            self._segment_artifacts[key] = artifact
+            while len(self._segment_artifacts) > _SEGMENT_ARTIFACT_CACHE_SIZE:
+                self._segment_artifacts.popitem(last=False)
+        return artifact
+
+    def _discard_segment_artifacts(self, job_id: str) -> None:
+        # Caller holds `_segment_artifacts_lock`.
+        for key in [key for key in self._segment_artifacts if key[0] == job_id]:
+            del self._segment_artifacts[key]
+
+    def segment_page(
+        self,
+        job: JobState,
+        start: float | None = None,
+        end: float | None = None,
+        speaker: str | None = None,
+        offset: int = 0,
+        limit: int = 200,
+    ) -> SegmentPage:
+        """Segments overlapping `[start, end)` seconds, optionally for one speaker, paged in time order."""
+        segments = self.segments(job)
+        indices = select_segments(segments, start, end, speaker)
+        window = indices[offset : offset + limit]
+        items = [{**segments[int(i)], "index": int(i)} for i in window]
+        next_offset = offset + limit if offset + limit < len(indices) else None
+        return SegmentPage(
+            items=items,
+            total=len(indices),
+            offset=offset,
+            next_offset=next_offset,
+            segments_revision=job.result.segments_revision,
+        )
+
+    def _store_segments(self, job: JobState, segments: Sequence[Dict[str, Any]]) -> None:
+        # Segments never stay resident: only their count lives on the job.
+        write_segments(self._segments_dir(job.id), segments)
+        job.result.segments = []
+        job.result.segment_count = len(segments)
+        job.result.segments_revision += 1
+
+    def _save_job(self, job: JobState, flush: bool = False) -> None:
+        """
+        Mark the job for the next write-behind flush. Terminal states (and `flush=True`)
+        are written immediately so a finished job is never lost to a crash.
+        """
+        job.version += 1
+        if flush or job.status in _TERMINAL_STATUSES:
+            with self._dirty_lock:
+                self._count_status(job)
+                self._dirty_job_ids.discard(job.id)
+            self.store.save(job)
+        else:
+            with self._dirty_lock:
+                self._count_status(job)
+                self._dirty_job_ids.add(job.id)
+        self.updates.publish(job.id)
+
+    def _count_status(self, job: JobState) -> None:
+        # Caller holds `_dirty_lock`.
+        previous = self._counted_status.get(job.id)
+        if previous != job.status:
+            if previous is not None:
+                self._status_counts[previous] -= 1
+            self._status_counts[job.status] += 1
+            self._counted_status[job.id] = job.status
+
+    def _flush_dirty_jobs(self) -> None:
+        with self._dirty_lock:
+            job_ids = list(self._dirty_job_ids)
+            self._dirty_job_ids.clear()
+        jobs = [self.jobs[job_id] for job_id in job_ids if job_id in self.jobs]
+        try:
+            self.store.save_many(jobs)
+        except Exception:
+            with self._dirty_lock:
+                self._dirty_job_ids.update(job_ids)
+            raise
+
+    async def _persist_loop(self) -> None:
+        interval = max(0.05, settings.job_persist_interval_seconds)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self._flush_dirty_jobs)
+            except Exception:
+                logger.exception("Failed to persist job state; will retry.")
+
+    def _import_legacy_jobs(self) -> None:
+        """Move jobs persisted as `job.json` files (before the job store existed) into the store."""
+        known = self.store.job_ids()
+        imported: List[JobState] = []
         for path in settings.jobs_dir.glob("*/job.json"):
+            if path.parent.name in known:
+                continue
             try:
-                raw = json.loads(path.read_text(encoding="utf-8"))
-                job = JobState.model_validate(raw)
-                job.created_at = self._ensure_aware_utc(job.created_at)
-                job.updated_at = self._ensure_aware_utc(job.updated_at)
-                if job.status in ("queued", "processing"):
-                    job.status = "failed"
-                    job.step = "interrupted"
-                    job.error = "Server restarted before job completion."
-                    job.updated_at = self._utcnow()
-                    self._push_event(job, "Marked interrupted after restart.")
-                    self._save_job(job)
-                self.jobs[job.id] = job
+                job = JobState.model_validate(json.loads(path.read_text(encoding="utf-8")))
             except Exception:
                 continue
+            job.created_at = self._ensure_aware_utc(job.created_at)
+            job.updated_at = self._ensure_aware_utc(job.updated_at)
+            job.event_count = max(job.event_count, len(job.events))
+            if job.result.segments:
+                self._store_segments(job, job.result.segments)
+            imported.append(job)
+        self.store.save_many(imported)
+
+    def _load_jobs_from_disk(self) -> List[JobState]:
+        """
+        Load only unfinished jobs and return those to re-enqueue; finished jobs stay in
+        the store's index and are loaded on demand.
+        """
+        self.jobs.clear()
+        resumable: List[JobState] = []
+        settings.jobs_dir.mkdir(parents=True, exist_ok=True)
+        if self.store.needs_legacy_import:
+            # A new database is filled from the per-job `job.json` files.
+            self._import_legacy_jobs()
+            self.store.mark_legacy_imported()
+        with self._dirty_lock:
+            self._status_counts = Counter(self.store.count_by_status())
+            self._counted_status.clear()
+        for job in self.store.load_by_status(("queued", "processing")):
+            self._adopt(job)
+            if job.cancel_requested:
+                self._mark_cancelled(job, "Cancelled before restart.")
+                continue
+            was_processing = job.status == "processing"
+            job.status = "queued"
+            job.step = "queued"
+            job.updated_at = self._utcnow()
+            if was_processing:
+                self._push_event(job, "Re-queued after restart; resuming from the last completed stage.")
+            self._save_job(job)
+            resumable.append(job)
+        return resumable
 
     def cancel_job(self, job_id: str) -> JobState:
         job = self.get_job(job_id)
@@ -268,11 +814,21 @@ class JobService:
         self._push_event(job, "Cancellation requested.")
 
         if job.status == "queued":
+            self.scheduler.discard(job_id)
             self._mark_cancelled(job, "Cancelled before execution.")
         else:
             job.step = "cancelling"
             job.updated_at = self._utcnow()
             self._save_job(job)
+            batch = self._running_batches.get(job_id)
+            if batch is not None:
+                # The other members still need the shared pass; this one is dropped when it ends.
+                if not all(member.cancel_requested for member in batch):
+                    return job
+                job_id = batch[0].id
+            if self.worker_pool:
+                # Kill the worker process now instead of waiting for the next progress tick.
+                self.worker_pool.cancel(job_id)
         return job
 
     def clear_queue(self, include_active: bool = True) -> int:
@@ -284,8 +840,9 @@ class JobService:
                 cleared += 1
             except KeyError:
                 continue
-        if include_active and self.current_job_id:
-            self.cancel_job(self.current_job_id)
+        if include_active:
+            for job_id in list(self.active_job_ids):
+                self.cancel_job(job_id)
         return cleared
 
     def delete_job(self, job_id: str, confirm_text: str) -> JobState:
@@ -298,10 +855,17 @@ class JobService:
         if not expected or provided != expected:
             raise RuntimeError("Confirmation text must exactly match the filename.")
 
-        if self.current_job_id == job_id:
+        if job_id in self.active_job_ids:
             raise RuntimeError("Cannot delete a job that is currently active.")
 
         self.jobs.pop(job_id, None)
+        with self._dirty_lock:
+            self._status_counts[self._counted_status.pop(job_id, job.status)] -= 1
+        self.store.delete(job_id)
+        self.updates.publish(job_id)
+        self.export_cache.discard_job(job_id)
+        with self._segment_artifacts_lock:
+            self._discard_segment_artifacts(job_id)
         job_dir = settings.jobs_dir / job_id
         if job_dir.exists():
             shutil.rmtree(job_dir)
@@ -328,17 +892,22 @@ class JobService:
 
         global_settings = self.global_settings_service.get()
         style_prompt = global_settings.summary_prompt_templates.get(style)
-        summary = await asyncio.to_thread(
-            self.summarization_service.summarize,
-            transcript,
-            style,
-            style_prompt,
-            global_settings.llm_api_base,
-            global_settings.llm_api_key,
-            global_settings.llm_model,
-            segments=job.result.segments,
-            speaker_name_overrides=speaker_name_overrides,
-        )
+        # Keep this instance resident so the result is not written to an evicted copy.
+        self._pinned_job_ids.add(job.id)
+        try:
+            summary = await asyncio.to_thread(
+                self.summarization_service.summarize,
+                transcript,
+                style,
+                style_prompt,
+                global_settings.llm_api_base,
+                global_settings.llm_api_key,
+                global_settings.llm_model,
+                segments=list(self.segments(job)),
+                speaker_name_overrides=speaker_name_overrides,
+            )
+        finally:
+            self._pinned_job_ids.discard(job.id)
         job.result.summary = summary
         job.result.summaries[style] = summary
         job.step = "done" if job.status == "completed" else job.step
@@ -347,12 +916,72 @@ class JobService:
         self._save_job(job)
         return job
 
+    async def rerun_stages(
+        self,
+        job_id: str,
+        stages: List[str],
+        diarization: bool | None = None,
+        alignment_language: str | None = None,
+    ) -> JobState:
+        """
+        Re-queue a finished job to redo only `stages` (align, diarize, export).
+
+        ASR is not repeated: the pipeline reloads the job's ASR checkpoint, decodes the
+        retained audio again, and only the invalidated stages and their dependents run.
+        """
+        job = self.get_job(job_id)
+        if job.status in ("queued", "processing") or job_id in self.active_job_ids:
+            raise RuntimeError("Stages can be re-run after the job finishes.")
+
+        # Validate against the requested values; the job is only changed once the re-run is accepted.
+        if diarization is None:
+            diarization = job.params.diarization
+        if alignment_language is None:
+            alignment_language = job.params.alignment_language
+        alignment_language = alignment_language or None
+
+        model_stages = [stage for stage in ("align", "diarize") if stage in stages]
+        checkpoints = StageCheckpoints(self._checkpoint_dir(job.id))
+        if model_stages:
+            if not checkpoints.exists("asr"):
+                # Jobs answered from the transcript cache never ran ASR themselves.
+                raise RuntimeError(
+                    "No saved speech-to-text output for this job (transcripts reused from the cache "
+                    "have none); upload it again to re-transcribe."
+                )
+            if not (job.audio_path and Path(job.audio_path).exists()):
+                raise RuntimeError("Processed audio for this job was not retained.")
+            if "diarize" in model_stages and not diarization:
+                raise RuntimeError("Enable diarization to re-run the diarize stage.")
+        elif not job.result.segment_count:
+            raise RuntimeError("Transcript is empty; nothing to export.")
+
+        job.params.diarization = diarization
+        job.params.alignment_language = alignment_language
+        if model_stages:
+            checkpoints.invalidate(model_stages)
+
+        # Speaker assignment and exports depend on alignment and diarization output.
+        redo = {"export"} | ({"transcribe"} if model_stages else set())
+        job.completed_stages = [stage for stage in job.completed_stages if stage not in redo]
+
+        job.status = "queued"
+        job.step = "queued"
+        job.progress = 0
+        job.error = None
+        job.cancel_requested = False
+        job.updated_at = self._utcnow()
+        self._push_event(job, f"Re-running stages: {', '.join(stages)}.")
+        self._save_job(job)
+        await self._enqueue(job)
+        return job
+
     def _transcript_for_summary(self, job: JobState) -> str:
         text = (job.result.transcript or "").strip()
         if text:
             return text
-        if job.result.segments:
-            return " ".join((seg.get("text", "").strip() for seg in job.result.segments)).strip()
+        if job.result.segment_count:
+            return " ".join((seg.get("text", "").strip() for seg in self.segments(job))).strip()
         return ""
 
     def _mark_cancelled(self, job: JobState, message: str) -> None:
@@ -379,6 +1008,10 @@ class JobService:
                     continue
             job.result.generated_files = {}
 
+        # The decoded waveform is only a working file (~115 MB per hour of audio); a re-run
+        # decodes the retained upload again instead of keeping it around.
+        self._remove_file_if_exists(self._waveform_path(job.id))
+
         if source and audio and source == audio:
             if not (job.params.retain_source_files or job.params.retain_processed_audio):
                 self._remove_file_if_exists(source)
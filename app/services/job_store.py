@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from app.schemas import JobState
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    -- Summary columns kept beside the JSON blob so listing never has to parse full job state.
+    file_type TEXT NOT NULL DEFAULT 'audio',
+    progress INTEGER NOT NULL DEFAULT 0,
+    step TEXT NOT NULL DEFAULT '',
+    error TEXT,
+    duration_seconds REAL,
+    segment_count INTEGER NOT NULL DEFAULT 0,
+    -- Epoch seconds: ISO strings with and without fractional seconds do not sort correctly as text.
+    created_ts REAL NOT NULL DEFAULT 0,
+    updated_ts REAL NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status);
+CREATE INDEX IF NOT EXISTS jobs_updated_ts_idx ON jobs (updated_ts, id);
+CREATE INDEX IF NOT EXISTS jobs_status_updated_ts_idx ON jobs (status, updated_ts, id);
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+) WITHOUT ROWID;
+"""
+_LIST_COLUMNS = ("id", "filename", "file_type", "status", "progress", "step", "error", "created_at", "updated_at")
+
+# Bumped once legacy `job.json` files have been imported.
+_SCHEMA_VERSION = 1
+
+# Kept in sync with the in-memory cap in JobService._push_event.
+MAX_EVENTS_PER_JOB = 120
+
+
+def _timestamp(value: str | datetime) -> float:
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _encode_cursor(updated_ts: float, job_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([updated_ts, job_id]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        updated_ts, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(updated_ts), str(job_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def _index_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "file_type": data.get("file_type", "audio"),
+        "progress": data.get("progress", 0),
+        "step": data.get("step", ""),
+        "error": data.get("error"),
+        "duration_seconds": data.get("duration_seconds"),
+        "segment_count": (data.get("result") or {}).get("segment_count", 0),
+        "created_ts": _timestamp(data["created_at"]),
+        "updated_ts": _timestamp(data["updated_at"]),
+    }
+
+
+def _matches(
+    row: Dict[str, Any],
+    bound: Tuple[float, str] | None,
+    statuses: Sequence[str] | None,
+    filename: str | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> bool:
+    """Python twin of the `list_page` WHERE clause, for rows not yet in the table."""
+    if bound:
+        updated_ts = _timestamp(row["updated_at"])
+        if not (updated_ts < bound[0] or (updated_ts == bound[0] and row["id"] < bound[1])):
+            return False
+    if statuses and row["status"] not in statuses:
+        return False
+    # LIKE is case-insensitive for ASCII only; casefold is close enough for unsaved rows.
+    if filename and filename.casefold() not in (row["filename"] or "").casefold():
+        return False
+    created_ts = _timestamp(row["created_at"])
+    if created_from and created_ts < _timestamp(created_from):
+        return False
+    if created_to and created_ts >= _timestamp(created_to):
+        return False
+    return True
+
+
+class JobStore:
+    """
+    Embedded SQLite (WAL) store for job state.
+
+    Metadata and events live in separate tables so a progress tick is a single small
+    row update with events appended. Summary columns on `jobs` serve as the job index:
+    startup and listing read those, and full job state is parsed only on demand.
+    Segments are kept out of the database in a per-job artifact (`app.utils.segments`).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        # Events already written per job, to keep saves incremental.
+        self._persisted_event_count: Dict[str, int] = {}
+        # A write-behind flush may still hold a job deleted meanwhile; never resurrect it.
+        self._deleted_ids: set[str] = set()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def needs_legacy_import(self) -> bool:
+        with self._lock:
+            return self._connection().execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION
+
+    def mark_legacy_imported(self) -> None:
+        with self._lock:
+            self._connection().execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def save(self, job: JobState) -> None:
+        self.save_many([job])
+
+    def save_many(self, jobs: Iterable[JobState]) -> None:
+        """Write all given jobs in one transaction."""
+        with self._lock:
+            pending = [job for job in jobs if job.id not in self._deleted_ids]
+            if not pending:
+                return
+            # One dump per job is a consistent snapshot even while a worker thread pushes events.
+            rows = [job.model_dump(mode="json", exclude={"result": {"segments"}}) for job in pending]
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                for data in rows:
+                    events = data.pop("events")
+                    values = {
+                        "filename": data["filename"],
+                        "status": data["status"],
+                        "created_at": data["created_at"],
+                        "updated_at": data["updated_at"],
+                        **_index_values(data),
+                        "data": json.dumps(data),
+                    }
+                    updates = ", ".join(f"{name} = excluded.{name}" for name in values if name != "created_at")
+                    conn.execute(
+                        f"""
+                        INSERT INTO jobs (id, {', '.join(values)})
+                        VALUES (?, {', '.join('?' for _ in values)})
+                        ON CONFLICT (id) DO UPDATE SET {updates}
+                        """,
+                        (data["id"], *values.values()),
+                    )
+                    self._append_events(conn, data["id"], events, data["event_count"])
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            for data in rows:
+                self._persisted_event_count[data["id"]] = data["event_count"]
+
+    def _append_events(self, conn: sqlite3.Connection, job_id: str, events: List[str], event_count: int) -> None:
+        persisted = self._persisted_event_count.get(job_id, 0)
+        new_count = min(event_count - persisted, len(events))
+        if new_count <= 0:
+            return
+        first_seq = event_count - new_count
+        conn.executemany(
+            "INSERT OR REPLACE INTO job_events (job_id, seq, message) VALUES (?, ?, ?)",
+            ((job_id, first_seq + i, message) for i, message in enumerate(events[-new_count:])),
+        )
+        conn.execute(
+            "DELETE FROM job_events WHERE job_id = ? AND seq < ?",
+            (job_id, event_count - MAX_EVENTS_PER_JOB),
+        )
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            conn.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+            conn.execute("COMMIT")
+            self._persisted_event_count.pop(job_id, None)
+            self._deleted_ids.add(job_id)
+
+    def job_ids(self) -> set[str]:
+        with self._lock:
+            return {row[0] for row in self._connection().execute("SELECT id FROM jobs")}
+
+    def list_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        statuses: Sequence[str] | None = None,
+        filename: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        pending: Sequence[Dict[str, Any]] = (),
+    ) -> Tuple[List[Dict[str, Any]], str | None]:
+        """
+        One page of summary rows, newest update first, walked with a keyset cursor on
+        `(updated_ts, id)` so each page costs O(limit) index steps however deep it is.
+
+        `pending` holds summary rows of jobs changed since their last save; they replace
+        the stored rows with the same id and are filtered and ordered the same way.
+        """
+        bound = _decode_cursor(cursor) if cursor else None
+        pending_ids = {row["id"] for row in pending}
+        overlay = [
+            {**row, "updated_ts": _timestamp(row["updated_at"])}
+            for row in pending
+            if _matches(row, bound, statuses, filename, created_from, created_to)
+        ]
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if bound:
+            updated_ts, job_id = bound
+            clauses.append("(updated_ts < ? OR (updated_ts = ? AND id < ?))")
+            params += [updated_ts, updated_ts, job_id]
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params += list(statuses)
+        if filename:
+            escaped = filename.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("filename LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if created_from:
+            clauses.append("created_ts >= ?")
+            params.append(_timestamp(created_from))
+        if created_to:
+            clauses.append("created_ts < ?")
+            params.append(_timestamp(created_to))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._connection().execute(
+                f"""
+                SELECT {', '.join(_LIST_COLUMNS)}, updated_ts FROM jobs {where}
+                ORDER BY updated_ts DESC, id DESC LIMIT ?
+                """,
+                # Stale rows of pending jobs are dropped below, so read past them.
+                (*params, limit + 1 + len(pending_ids)),
+            ).fetchall()
+        merged = [dict(zip((*_LIST_COLUMNS, "updated_ts"), row)) for row in rows if row[0] not in pending_ids]
+        if overlay:
+            merged = sorted(merged + overlay, key=lambda row: (row["updated_ts"], row["id"]), reverse=True)
+        next_cursor = None
+        if len(merged) > limit:
+            merged = merged[:limit]
+            next_cursor = _encode_cursor(merged[-1]["updated_ts"], merged[-1]["id"])
+        return [{key: row[key] for key in _LIST_COLUMNS} for row in merged], next_cursor
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def load(self, job_id: str) -> JobState | None:
+        with self._lock:
+            row = self._connection().execute("SELECT id, data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._hydrate(*row) if row else None
+
+    def load_by_status(self, statuses: Iterable[str]) -> List[JobState]:
+        wanted = list(statuses)
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT id, data FROM jobs WHERE status IN ({', '.join('?' for _ in wanted)})", wanted
+            ).fetchall()
+            jobs = [self._hydrate(job_id, raw) for job_id, raw in rows]
+        return [job for job in jobs if job is not None]
+
+    def _hydrate(self, job_id: str, raw: str) -> JobState | None:
+        """Rebuild full job state from its row; caller holds the lock. Invalid rows yield None."""
+        conn = self._connection()
+        try:
+            data = json.loads(raw)
+            data["events"] = [
+                message
+                for (message,) in conn.execute(
+                    "SELECT message FROM job_events WHERE job_id = ? ORDER BY seq", (job_id,)
+                )
+            ]
+            job = JobState.model_validate(data)
+        except Exception:
+            return None
+        self._persisted_event_count[job.id] = job.event_count
+        return job
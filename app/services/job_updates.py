@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Dict, Set
+
+ALL_JOBS = "*"
+
+
+class JobSubscription:
+    """
+    Change notifications for one job (or all jobs) delivered to a single async consumer.
+
+    Bursts are coalesced: the consumer wakes once and receives the set of job ids
+    that changed since it last looked, then reads their current state itself.
+    """
+
+    def __init__(self, key: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.key = key
+        self._loop = loop
+        self._changed = asyncio.Event()
+        self._job_ids: Set[str] = set()
+
+    def _notify(self, job_id: str) -> None:
+        self._job_ids.add(job_id)
+        self._changed.set()
+
+    def notify(self, job_id: str) -> None:
+        """Thread-safe: may be called from transcription worker threads."""
+        try:
+            self._loop.call_soon_threadsafe(self._notify, job_id)
+        except RuntimeError:
+            # Event loop already closed (shutdown); nobody is listening any more.
+            pass
+
+    async def wait(self, timeout: float) -> Set[str]:
+        """Return job ids changed since the last call, or an empty set after `timeout` seconds."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return set()
+        self._changed.clear()
+        job_ids, self._job_ids = self._job_ids, set()
+        return job_ids
+
+
+class JobUpdateBus:
+    """In-process pub/sub that lets streaming endpoints follow job changes without polling."""
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Set[JobSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id: str = ALL_JOBS) -> JobSubscription:
+        subscription = JobSubscription(job_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: JobSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.key)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[subscription.key]
+
+    def publish(self, job_id: str) -> None:
+        with self._lock:
+            targets = [
+                *self._subscriptions.get(job_id, ()),
+                *self._subscriptions.get(ALL_JOBS, ()),
+            ]
+        for subscription in targets:
+            subscription.notify(job_id)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Approximate resident footprint (MB) of faster-whisper checkpoints at float32.
+# Used only for budget accounting; real usage varies with backend and batch size.
+# Matched by substring in order, so more specific names come first.
+_MODEL_SIZE_MB: Dict[str, int] = {
+    "turbo": 3200,
+    "tiny": 150,
+    "base": 300,
+    "small": 1000,
+    "medium": 3000,
+    "large": 6000,
+}
+
+_COMPUTE_TYPE_SCALE: Dict[str, float] = {
+    "float32": 1.0,
+    "float16": 0.5,
+    "bfloat16": 0.5,
+    "int8_float16": 0.35,
+    "int8_float32": 0.35,
+    "int8": 0.3,
+}
+
+
+def estimate_model_size_mb(model_name: str, compute_type: str) -> int:
+    name = (model_name or "").lower()
+    base = next(
+        (size for prefix, size in _MODEL_SIZE_MB.items() if prefix in name),
+        _MODEL_SIZE_MB["large"],
+    )
+    return max(1, int(base * _COMPUTE_TYPE_SCALE.get(compute_type, 1.0)))
+
+
+def memory_pool_for_device(device: str) -> str:
+    return "vram" if str(device).startswith("cuda") else "ram"
+
+
+def release_device_memory(device: str) -> None:
+    gc.collect()
+    if memory_pool_for_device(device) != "vram":
+        return
+    try:
+        import torch
+
+        # empty_cache only releases blocks of the current device, so switch to the entry's GPU.
+        with torch.cuda.device(torch.device(device)):
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size_mb: int
+    pool: str
+    device: str
+    last_used: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    idle_evictions: int = 0
+    loads_failed: int = 0
+
+
+class MemoryLedger:
+    """
+    Per-pool (RAM/VRAM) budgets in MB shared by several model caches in one process.
+
+    Admitting an entry evicts the least recently used entries of the same pool across
+    every registered cache, so the caches together never exceed the budget.
+    """
+
+    def __init__(self, budgets_mb: Dict[str, int]) -> None:
+        self.budgets_mb = dict(budgets_mb)
+        self._caches: List["ModelCache"] = []
+        # Taken before any cache lock, never after one.
+        self._lock = threading.RLock()
+
+    def register(self, cache: "ModelCache") -> None:
+        with self._lock:
+            self._caches.append(cache)
+
+    def used_mb(self, pool: str) -> int:
+        with self._lock:
+            return sum(cache._used_mb(pool) for cache in self._caches)
+
+    def admit(self, cache: "ModelCache", key: Hashable, entry: _Entry) -> List[Tuple["ModelCache", Hashable, _Entry]] | None:
+        """Make room for `entry` and add it to `cache`; returns the evictions, or None if the pool is disabled."""
+        with self._lock:
+            budget = self.budgets_mb.get(entry.pool, 0)
+            if budget <= 0:
+                return None
+            # An entry larger than the whole budget is still kept while it is the only one.
+            evicted = self._evict_down_to(entry.pool, budget - entry.size_mb)
+            with cache._lock:
+                cache._entries[key] = entry
+        return evicted
+
+    def set_budgets(self, budgets_mb: Dict[str, int]) -> List[Tuple["ModelCache", Hashable, _Entry]]:
+        with self._lock:
+            self.budgets_mb = dict(budgets_mb)
+            evicted = []
+            for pool, budget in self.budgets_mb.items():
+                evicted += self._evict_down_to(pool, max(0, budget))
+        return evicted
+
+    def _evict_down_to(self, pool: str, target_mb: int) -> List[Tuple["ModelCache", Hashable, _Entry]]:
+        evicted: List[Tuple["ModelCache", Hashable, _Entry]] = []
+        while self.used_mb(pool) > target_mb:
+            candidates = [
+                (entry.last_used, index, cache, key)
+                for index, cache in enumerate(self._caches)
+                for key, entry in list(cache._entries.items())
+                if entry.pool == pool
+            ]
+            if not candidates:
+                break
+            _, _, cache, key = min(candidates, key=lambda c: (c[0], c[1]))
+            with cache._lock:
+                entry = cache._entries.pop(key, None)
+                if entry is None:
+                    continue  # dropped as idle meanwhile
+                cache._stats.evictions += 1
+            evicted.append((cache, key, entry))
+        return evicted
+
+
+def _release_evicted(evicted: List[Tuple["ModelCache", Hashable, _Entry]]) -> None:
+    for cache, key, entry in evicted:
+        logger.info("%s cache evicted %s (%d MB, %s).", cache.name, key, entry.size_mb, entry.pool)
+        release_device_memory(entry.device)
+
+
+class ModelCache:
+    """
+    Process-wide LRU registry for loaded models.
+
+    Entries are accounted against the per-pool (RAM/VRAM) budgets of a shared
+    `MemoryLedger`; when a new entry would exceed its pool's budget, the least
+    recently used entries in that pool are evicted first, from this or any other
+    cache on the same ledger. A budget of 0 disables residency for that pool. With
+    `idle_timeout_seconds` set, entries unused for longer are dropped as well.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ledger: MemoryLedger,
+        idle_timeout_seconds: float | None = None,
+    ) -> None:
+        self.name = name
+        self.ledger = ledger
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: Dict[Hashable, threading.Lock] = {}
+        self._stats = CacheStats()
+        ledger.register(self)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        size_mb: int,
+        device: str,
+    ) -> Tuple[Any, bool]:
+        """Return `(value, cache_hit)`, loading and admitting the value on a miss."""
+        self.evict_idle()
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry.value, True
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Serialize loads per key so concurrent jobs don't load the same weights twice.
+        with load_lock:
+            with self._lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    return entry.value, True
+                self._stats.misses += 1
+
+            try:
+                value = loader()
+            except Exception:
+                with self._lock:
+                    self._stats.loads_failed += 1
+                raise
+
+            pool = memory_pool_for_device(device)
+            self._admit(
+                key,
+                _Entry(value=value, size_mb=size_mb, pool=pool, device=device, last_used=time.monotonic()),
+            )
+            return value, False
+
+    def _touch(self, key: Hashable) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        entry.last_used = time.monotonic()
+        self._stats.hits += 1
+        return entry
+
+    def _admit(self, key: Hashable, entry: _Entry) -> None:
+        evicted = self.ledger.admit(self, key, entry)
+        if evicted is None:
+            return
+        _release_evicted(evicted)
+        logger.info("%s cache loaded %s (%d MB, %s).", self.name, key, entry.size_mb, entry.pool)
+
+    def evict_idle(self) -> int:
+        if not self.idle_timeout_seconds or self.idle_timeout_seconds <= 0:
+            return 0
+        cutoff = time.monotonic() - self.idle_timeout_seconds
+        with self._lock:
+            expired = [(k, e) for k, e in self._entries.items() if e.last_used < cutoff]
+            for key, _ in expired:
+                self._entries.pop(key, None)
+            self._stats.idle_evictions += len(expired)
+        for key, entry in expired:
+            logger.info("%s cache dropped idle entry %s.", self.name, key)
+            release_device_memory(entry.device)
+        return len(expired)
+
+    def _used_mb(self, pool: str) -> int:
+        return sum(e.size_mb for e in list(self._entries.values()) if e.pool == pool)
+
+    def clear(self) -> None:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            release_device_memory(entry.device)
+
+    @staticmethod
+    def _format_key(key: Hashable) -> Any:
+        if isinstance(key, tuple):
+            return [str(part) for part in key]
+        return str(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self._stats.hits,
+                "misses": self._stats.misses,
+                "evictions": self._stats.evictions,
+                "idle_evictions": self._stats.idle_evictions,
+                "loads_failed": self._stats.loads_failed,
+                "idle_timeout_seconds": self.idle_timeout_seconds,
+                "used_mb": {pool: self._used_mb(pool) for pool in ("ram", "vram")},
+                "entries": [
+                    {"key": self._format_key(key), "size_mb": e.size_mb, "pool": e.pool}
+                    for key, e in self._entries.items()
+                ],
+            }
+
+
+# One ledger for all three caches, so the configured budgets cap their combined residency.
+model_memory_ledger = MemoryLedger(
+    {"ram": settings.model_cache_max_ram_mb, "vram": settings.model_cache_max_vram_mb}
+)
+
+asr_model_cache = ModelCache("asr", model_memory_ledger)
+align_model_cache = ModelCache(
+    "alignment",
+    model_memory_ledger,
+    idle_timeout_seconds=settings.aux_model_cache_idle_seconds,
+)
+diarization_pipeline_cache = ModelCache(
+    "diarization",
+    model_memory_ledger,
+    idle_timeout_seconds=settings.aux_model_cache_idle_seconds,
+)
+
+
+def model_cache_budgets() -> Dict[str, int]:
+    return dict(model_memory_ledger.budgets_mb)
+
+
+def set_model_cache_budgets(budgets_mb: Dict[str, int]) -> None:
+    """Apply this process's share of the budgets (worker processes get a slice of the configured total)."""
+    _release_evicted(model_memory_ledger.set_budgets(budgets_mb))
+
+
+def split_ram_budget(parts: int) -> Dict[str, int]:
+    """
+    Shrink this process's RAM budget to one of `parts` equal shares and return the budgets
+    for a CPU-only child process holding one of the other shares. VRAM is left untouched.
+    """
+    budgets = model_cache_budgets()
+    share = budgets.get("ram", 0) // max(1, parts)
+    set_model_cache_budgets({**budgets, "ram": share})
+    return {"ram": share, "vram": 0}
+
+
+def evict_idle_models() -> int:
+    return sum(cache.evict_idle() for cache in (asr_model_cache, align_model_cache, diarization_pipeline_cache))
+
+
+def model_cache_stats() -> Dict[str, Any]:
+    return {
+        "budgets_mb": model_cache_budgets(),
+        "used_mb": {pool: model_memory_ledger.used_mb(pool) for pool in ("ram", "vram")},
+        "asr_models": asr_model_cache.stats(),
+        "alignment_models": align_model_cache.stats(),
+        "diarization_pipelines": diarization_pipeline_cache.stats(),
+    }
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Tuple, Type
+
+from app.config import settings
+
+PRIORITY_LEVELS: Dict[str, int] = {"low": 0, "normal": 1, "high": 2}
+
+
+@dataclass
+class QueueEntry:
+    job_id: str
+    priority: int
+    duration_seconds: float | None
+    enqueued_at: float
+    seq: int
+
+
+class SchedulingPolicy:
+    """
+    Orders queued jobs; lower `rank` runs first.
+
+    Priority levels dominate, but every `scheduler_priority_aging_seconds` of waiting
+    promotes a job by one level, and within a level `cost` is reduced by
+    `scheduler_aging_rate` per second waited, so nothing starves.
+    """
+
+    name = "fifo"
+
+    def cost(self, entry: QueueEntry) -> float:
+        return 0.0
+
+    def rank(self, entry: QueueEntry, now: float) -> Tuple[float, float, int]:
+        waited = max(0.0, now - entry.enqueued_at)
+        level_age = settings.scheduler_priority_aging_seconds
+        promoted = entry.priority + (int(waited // level_age) if level_age > 0 else 0)
+        effective_priority = min(promoted, max(PRIORITY_LEVELS.values()))
+        return (-effective_priority, self.cost(entry) - settings.scheduler_aging_rate * waited, entry.seq)
+
+
+class FifoPolicy(SchedulingPolicy):
+    name = "fifo"
+
+    def rank(self, entry: QueueEntry, now: float) -> Tuple[float, float, int]:
+        # Priority still applies; arrival order decides within a level.
+        base = super().rank(entry, now)
+        return (base[0], 0.0, entry.seq)
+
+
+class ShortestJobFirstPolicy(SchedulingPolicy):
+    name = "sjf"
+
+    def cost(self, entry: QueueEntry) -> float:
+        if entry.duration_seconds is None:
+            return settings.scheduler_unknown_duration_seconds
+        return entry.duration_seconds
+
+
+POLICIES: Dict[str, Type[SchedulingPolicy]] = {
+    FifoPolicy.name: FifoPolicy,
+    ShortestJobFirstPolicy.name: ShortestJobFirstPolicy,
+}
+
+
+def register_policy(policy: Type[SchedulingPolicy]) -> None:
+    POLICIES[policy.name] = policy
+
+
+class JobScheduler:
+    """Awaitable job queue whose dequeue order is decided by a pluggable policy."""
+
+    def __init__(self, policy: str | None = None) -> None:
+        policy_name = policy or settings.scheduler_policy
+        if policy_name not in POLICIES:
+            raise ValueError(f"Unknown scheduler policy: {policy_name}")
+        self.policy = POLICIES[policy_name]()
+        self._entries: Dict[str, QueueEntry] = {}
+        self._seq = itertools.count()
+        self._available = asyncio.Condition()
+        # Observed processing seconds per second of audio, smoothed across jobs.
+        self.realtime_factor = settings.scheduler_default_realtime_factor
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._entries
+
+    async def put(self, job_id: str, priority: int = PRIORITY_LEVELS["normal"], duration_seconds: float | None = None) -> None:
+        self._entries[job_id] = QueueEntry(
+            job_id=job_id,
+            priority=priority,
+            duration_seconds=duration_seconds,
+            enqueued_at=time.monotonic(),
+            seq=next(self._seq),
+        )
+        async with self._available:
+            self._available.notify()
+
+    async def get(self) -> str:
+        async with self._available:
+            await self._available.wait_for(lambda: bool(self._entries))
+            entry = min(self._entries.values(), key=lambda e: self.policy.rank(e, time.monotonic()))
+            del self._entries[entry.job_id]
+            return entry.job_id
+
+    def discard(self, job_id: str) -> bool:
+        return self._entries.pop(job_id, None) is not None
+
+    def ordered(self) -> List[QueueEntry]:
+        now = time.monotonic()
+        return sorted(self._entries.values(), key=lambda e: self.policy.rank(e, now))
+
+    def take_matching(self, predicate: Callable[[str], bool], limit: int) -> List[str]:
+        """Remove and return up to `limit` queued job ids, in policy order, matching `predicate`."""
+        taken: List[str] = []
+        for entry in self.ordered():
+            if len(taken) >= limit:
+                break
+            if predicate(entry.job_id):
+                self.discard(entry.job_id)
+                taken.append(entry.job_id)
+        return taken
+
+    def position(self, job_id: str) -> int | None:
+        for index, entry in enumerate(self.ordered(), start=1):
+            if entry.job_id == job_id:
+                return index
+        return None
+
+    def record_completion(self, duration_seconds: float | None, elapsed_seconds: float) -> None:
+        if not duration_seconds or duration_seconds <= 0 or elapsed_seconds <= 0:
+            return
+        observed = elapsed_seconds / duration_seconds
+        self.realtime_factor = 0.8 * self.realtime_factor + 0.2 * observed
+
+    def estimated_processing_seconds(self, duration_seconds: float | None) -> float:
+        duration = duration_seconds if duration_seconds is not None else settings.scheduler_unknown_duration_seconds
+        return duration * self.realtime_factor
+
+    def estimate_start(
+        self,
+        job_id: str,
+        active_remaining_seconds: Iterable[float],
+        workers: int,
+    ) -> datetime | None:
+        """Simulate `workers` parallel workers draining the queue in policy order."""
+        free_at = sorted(active_remaining_seconds)[:workers]
+        free_at += [0.0] * (max(1, workers) - len(free_at))
+        heapq.heapify(free_at)
+        for entry in self.ordered():
+            start = heapq.heappop(free_at)
+            if entry.job_id == job_id:
+                return datetime.now(timezone.utc) + timedelta(seconds=start)
+            heapq.heappush(free_at, start + self.estimated_processing_seconds(entry.duration_seconds))
+        return None
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from app.config import settings
+from app.schemas import JobCreateParams
+from app.utils.serialization import json_default
+
+
+class TranscriptCache:
+    """
+    Content-addressed store of finished transcription results.
+
+    Keys combine the upload's SHA-256 with every parameter that changes ASR output,
+    so an identical re-upload with the same settings can skip the pipeline entirely.
+    """
+
+    def __init__(self) -> None:
+        self.path = settings.storage_dir / "cache" / "transcripts"
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(content_hash: str, params: JobCreateParams) -> str:
+        parts = [
+            content_hash,
+            params.model_name,
+            params.language or "",
+            params.compute_type,
+            "diarized" if params.diarization else "plain",
+            "trimmed" if params.trim_silence else "full",
+            params.alignment_language or "",
+        ]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        if not settings.transcript_cache_enabled:
+            return None
+        p = self._entry_path(key)
+        try:
+            raw = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        # Touch so pruning keeps recently reused entries.
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        return raw
+
+    def contains(self, key: str) -> bool:
+        return settings.transcript_cache_enabled and self._entry_path(key).exists()
+
+    def put(self, key: str, result: Dict[str, Any], source_job_id: str) -> None:
+        if not settings.transcript_cache_enabled:
+            return
+        entry = {
+            "source_job_id": source_job_id,
+            "text": result.get("text", ""),
+            "segments": result.get("segments", []),
+            "language": result.get("language"),
+        }
+        self.path.mkdir(parents=True, exist_ok=True)
+        p = self._entry_path(key)
+        tmp = p.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False, default=json_default), encoding="utf-8")
+        os.replace(tmp, p)
+        self._prune()
+
+    def _prune(self) -> None:
+        limit = settings.transcript_cache_max_entries
+        if limit <= 0:
+            return
+        with self._lock:
+            entries = []
+            for p in self.path.glob("*.json"):
+                try:
+                    entries.append((p.stat().st_mtime, p))
+                except OSError:
+                    continue
+            entries.sort(reverse=True)
+            for _, stale in entries[limit:]:
+                stale.unlink(missing_ok=True)
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import inspect
+import multiprocessing as mp
+import threading
 import warnings
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Callable, Dict, cast
+from typing import Any, Callable, Dict, List, cast
+
 
 # pyannote emits this at import time when torchcodec/ffmpeg dynamic deps are unavailable.
 # We pass in-memory audio for diarization, so decoding through torchcodec is not required.
@@ -33,11 +39,139 @@ import whisperx
 
 from app.config import settings
 from app.schemas import JobCreateParams
+from app.services.model_cache import (
+    align_model_cache,
+    asr_model_cache,
+    diarization_pipeline_cache,
+    estimate_model_size_mb,
+    set_model_cache_budgets,
+    split_ram_budget,
+)
+from app.utils.audio import (
+    SAMPLE_RATE,
+    TimeMap,
+    compact_audio,
+    concatenate_with_gaps,
+    detect_speech_spans,
+    find_silence_boundaries,
+    decode_to_pcm,
+    ensure_waveform,
+    load_waveform,
+    pcm_to_float,
+    plan_chunks,
+    remap_result_timestamps,
+    split_concatenated_segments,
+    stitch_chunk_segments,
+)
+from app.utils.checkpoints import StageCheckpoints, fingerprint
+
+# Rough footprints for budget accounting of auxiliary models.
+_ALIGN_MODEL_SIZE_MB = 400
+_DIARIZATION_PIPELINE_SIZE_MB = 300
+
+# WhisperX's VAD merges speech into windows of up to 30s; a longer silent gap between
+# batched recordings guarantees no window (and so no segment) spans two of them.
+_BATCH_GAP_SECONDS = 31.0
+
+# Guards the tokenizer reset in `_run_transcribe`, per shared pipeline instance.
+_pipeline_locks: Dict[int, threading.Lock] = {}
+_pipeline_locks_guard = threading.Lock()
+
+_chunk_executor: ProcessPoolExecutor | None = None
+_chunk_executor_lock = threading.Lock()
+# Model cache budgets handed to each chunk worker; set by `reserve_chunk_worker_budgets`.
+_chunk_worker_budgets: Dict[str, int] | None = None
+_chunk_service: "TranscriptionService | None" = None
+
+
+def _run_transcribe(model: Any, audio: Any, batch_size: int, language: str | None) -> Dict[str, Any]:
+    """
+    Transcribe with a (possibly cached, shared) WhisperX pipeline.
+
+    The pipeline keeps the tokenizer of its previous call and, when no language is
+    passed, reuses that tokenizer's language instead of detecting it. Without a fixed
+    language the tokenizer is therefore cleared so detection runs on this audio; the
+    lock keeps concurrent auto-detect jobs on the same pipeline from swapping it mid-run.
+    """
+    if language:
+        return cast(Dict[str, Any], model.transcribe(audio, batch_size=batch_size, language=language))
+    with _pipeline_locks_guard:
+        lock = _pipeline_locks.setdefault(id(model), threading.Lock())
+    with lock:
+        model.tokenizer = None
+        return cast(Dict[str, Any], model.transcribe(audio, batch_size=batch_size))
+
+
+def _init_chunk_worker(cpu_threads: int, budgets_mb: Dict[str, int]) -> None:
+    global _chunk_service
+    set_model_cache_budgets(budgets_mb)
+    try:
+        import torch
+
+        torch.set_num_threads(cpu_threads)
+    except Exception:
+        pass
+    _chunk_service = TranscriptionService(cpu_threads=cpu_threads)
+
+
+def _transcribe_chunk(
+    model_name: str,
+    device: str,
+    compute_type: str,
+    language: str | None,
+    batch_size: int,
+    audio: Any,
+) -> Dict[str, Any]:
+    # `audio` is either an array slice or `(waveform_path, start, end)` to read from the shared memmap.
+    if isinstance(audio, tuple):
+        waveform_path, start, end = audio
+        audio = pcm_to_float(load_waveform(Path(waveform_path))[start:end])
+    service = _chunk_service or TranscriptionService()
+    service._prepare_torch_checkpoint_loading()
+    service._patch_torch_load()
+    model, _ = service._load_asr_model(model_name, device, compute_type, language)
+    return _run_transcribe(model, audio, batch_size, language)
+
+
+def reserve_chunk_worker_budgets() -> None:
+    """
+    Set aside the long-audio chunk workers' share of this process's RAM budget when the
+    process starts, so the first long recording does not shrink it and evict resident
+    models mid-run. Chunk workers only run on CPU, so the VRAM budget stays whole.
+    """
+    global _chunk_worker_budgets
+    with _chunk_executor_lock:
+        if _chunk_worker_budgets is not None:
+            return
+        if settings.long_audio_threshold_seconds <= 0 or settings.long_audio_workers <= 1:
+            return
+        _chunk_worker_budgets = split_ram_budget(settings.long_audio_workers + 1)
+
+
+def _get_chunk_executor() -> ProcessPoolExecutor:
+    """Long-lived pool so chunk workers keep their models resident between jobs."""
+    global _chunk_executor
+    # Normally done at process start; only direct service use gets here without it.
+    reserve_chunk_worker_budgets()
+    with _chunk_executor_lock:
+        if _chunk_executor is None:
+            workers = max(1, settings.long_audio_workers)
+            _chunk_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(max(1, (os.cpu_count() or 1) // workers), _chunk_worker_budgets or {"ram": 0, "vram": 0}),
+            )
+        return _chunk_executor
 
 
 class TranscriptionService:
     _torch_load_patched: bool = False
 
+    def __init__(self, cpu_threads: int | None = None) -> None:
+        # CTranslate2 intra-op threads for CPU inference; None keeps the WhisperX default.
+        self.cpu_threads = cpu_threads
+
     @staticmethod
     def _prepare_torch_checkpoint_loading() -> None:
         """
@@ -136,7 +270,7 @@ class TranscriptionService:
         if requested_device == "auto":
             return "cuda" if torch.cuda.is_available() else "cpu"
 
-        if requested_device == "cuda" and not torch.cuda.is_available():
+        if requested_device.startswith("cuda") and not torch.cuda.is_available():
             raise RuntimeError(
                 "CUDA was selected, but no CUDA/ROCm runtime is available for this PyTorch install. "
                 "For AMD GPUs, use a ROCm-compatible PyTorch build (typically on Linux). "
@@ -144,72 +278,382 @@ class TranscriptionService:
             )
         return requested_device
 
-    def transcribe(
+    @staticmethod
+    def _indexed_device(device: str) -> str:
+        # Plain "cuda" means the first GPU; spelled out so cache keys match slot-assigned devices.
+        return "cuda:0" if device == "cuda" else device
+
+    def _load_asr_model(
+        self, model_name: str, device: str, compute_type: str, language: str | None
+    ) -> tuple[Any, bool]:
+        device = self._indexed_device(device)
+        key = (model_name, device, compute_type, language)
+        load_kwargs: Dict[str, Any] = {"compute_type": compute_type, "language": language}
+        if self.cpu_threads and device == "cpu":
+            load_kwargs["threads"] = self.cpu_threads
+        # faster-whisper takes the GPU as a separate index rather than a "cuda:N" string.
+        device_type, _, index = device.partition(":")
+        if index:
+            load_kwargs["device_index"] = int(index)
+        return asr_model_cache.get_or_load(
+            key,
+            lambda: whisperx.load_model(model_name, device_type, **load_kwargs),
+            size_mb=estimate_model_size_mb(model_name, compute_type),
+            device=device,
+        )
+
+    @classmethod
+    def _load_align_model(cls, language_code: str, device: str) -> tuple[Any, bool]:
+        device = cls._indexed_device(device)
+        return align_model_cache.get_or_load(
+            (language_code, device),
+            lambda: whisperx.load_align_model(language_code=language_code, device=device),
+            size_mb=_ALIGN_MODEL_SIZE_MB,
+            device=device,
+        )
+
+    def _load_diarization_pipeline(self, hf_token: str, device: str) -> tuple[Any, bool]:
+        device = self._indexed_device(device)
+        diarization_pipeline, _ = self._get_diarization_components()
+        # Key on a token digest so cache stats never expose the secret.
+        token_key = hashlib.sha256(hf_token.encode("utf-8")).hexdigest()[:12]
+        return diarization_pipeline_cache.get_or_load(
+            (token_key, device),
+            lambda: self._build_diarization_pipeline(diarization_pipeline, hf_token, device),
+            size_mb=_DIARIZATION_PIPELINE_SIZE_MB,
+            device=device,
+        )
+
+    def warm_up(self, params: JobCreateParams) -> None:
+        """Load the ASR (and, for a fixed language, alignment) model into the resident caches."""
+        self._prepare_torch_checkpoint_loading()
+        self._patch_torch_load()
+        device = self._resolve_device(params.device or settings.default_device)
+        language = params.language or None
+        self._load_asr_model(params.model_name or settings.default_model, device, params.compute_type, language)
+        if language:
+            self._load_align_model(language, device)
+
+    @staticmethod
+    def _use_long_audio_mode(audio: Any, device: str) -> bool:
+        # GPU batching already saturates the device; fan-out only pays off on CPU cores.
+        threshold = settings.long_audio_threshold_seconds
+        if threshold <= 0 or device != "cpu" or settings.long_audio_workers <= 1:
+            return False
+        return len(audio) / SAMPLE_RATE >= threshold
+
+    def _transcribe_chunked(
         self,
-        audio_path: Path,
+        audio: Any,
         params: JobCreateParams,
+        model_name: str,
+        device: str,
+        language: str | None,
         progress_cb: Callable[[int, str, str], None] | None = None,
-        hf_token: str | None = None,
+        waveform_path: Path | None = None,
     ) -> Dict[str, Any]:
-        self._prepare_torch_checkpoint_loading()
-        self._patch_torch_load()
+        boundaries = find_silence_boundaries(audio, settings.long_audio_chunk_seconds)
+        chunks = plan_chunks(len(audio), boundaries, settings.long_audio_overlap_seconds)
+        if progress_cb:
+            progress_cb(
+                30,
+                "transcribing",
+                f"Long recording: transcribing {len(chunks)} chunks on {settings.long_audio_workers} workers.",
+            )
 
-        requested_device = params.device or settings.default_device
-        device = self._resolve_device(requested_device)
-        model_name = params.model_name or settings.default_model
-        language = params.language or None
+        executor = _get_chunk_executor()
+        futures: Dict[Future, int] = {
+            executor.submit(
+                _transcribe_chunk,
+                model_name,
+                device,
+                params.compute_type,
+                language,
+                params.batch_size,
+                (str(waveform_path), read_start, read_end) if waveform_path else audio[read_start:read_end],
+            ): index
+            for index, (read_start, read_end, _, _) in enumerate(chunks)
+        }
+        results: List[Dict[str, Any] | None] = [None] * len(chunks)
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[futures[future]] = future.result()
+                if progress_cb:
+                    finished = len(chunks) - len(pending)
+                    progress_cb(
+                        30 + int(25 * finished / len(chunks)),
+                        "transcribing",
+                        f"Transcribed chunk {finished}/{len(chunks)}.",
+                    )
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+        chunk_results = []
+        languages: Counter[str] = Counter()
+        for (read_start, _, own_start, own_end), chunk_result in zip(chunks, results):
+            chunk_result = chunk_result or {}
+            if chunk_result.get("language"):
+                languages[chunk_result["language"]] += 1
+            chunk_results.append((read_start, own_start, own_end, chunk_result.get("segments", [])))
 
+        detected = language or (languages.most_common(1)[0][0] if languages else None)
+        return {"segments": stitch_chunk_segments(chunk_results), "language": detected}
+
+    @staticmethod
+    def _trim_silence(
+        audio: Any,
+        progress_cb: Callable[[int, str, str], None] | None = None,
+        checkpoints: StageCheckpoints | None = None,
+    ) -> tuple[Any, TimeMap]:
+        trim_fp = fingerprint("trim", settings.trim_silence_min_seconds, len(audio))
+        spans = checkpoints.load("trim", trim_fp) if checkpoints else None
+        if spans is None:
+            spans = detect_speech_spans(audio, min_silence_seconds=settings.trim_silence_min_seconds)
+            if checkpoints:
+                checkpoints.save("trim", trim_fp, spans)
+        kept = sum(end - start for start, end in spans)
+        if not spans or kept >= len(audio) * 0.98:
+            return audio, []
+        compact, time_map = compact_audio(audio, [tuple(span) for span in spans])
         if progress_cb:
-            progress_cb(15, "loading model", f"Loading WhisperX model '{model_name}' on {device}.")
-        model = whisperx.load_model(
-            model_name,
-            device,
-            compute_type=params.compute_type,
-            language=language,
+            removed = 100 * (1 - kept / max(1, len(audio)))
+            progress_cb(
+                12,
+                "preparing",
+                f"Trimmed {removed:.0f}% silence ({len(audio) / SAMPLE_RATE:.0f}s -> {kept / SAMPLE_RATE:.0f}s).",
+            )
+        return compact, time_map
+
+    @staticmethod
+    def _load_audio(audio_path: Path, waveform_path: Path | None) -> tuple[Any, Path | None]:
+        """
+        The recording as float32 samples, plus the on-disk 16 kHz PCM it was read from
+        (for chunk workers). Without a `waveform_path` nothing is kept on disk.
+        """
+        if waveform_path is None:
+            return whisperx.load_audio(str(audio_path)), None
+        pcm_path = ensure_waveform(
+            audio_path, waveform_path, lambda source, target: decode_to_pcm(source, target, settings.ffmpeg_binary)
         )
+        return pcm_to_float(load_waveform(pcm_path)), pcm_path
+
+    def _diarize(self, audio: Any, hf_token: str, device: str) -> Any:
+        diarize_model, _ = self._load_diarization_pipeline(hf_token, device)
+        return self._normalize_diarization_output(diarize_model(audio))
+
+    @staticmethod
+    def _diarization_records(diarize_segments: Any) -> List[Dict[str, Any]]:
+        return diarize_segments[["start", "end", "speaker"]].to_dict("records")
+
+    @staticmethod
+    def _diarization_frame(records: List[Dict[str, Any]]) -> Any:
+        import pandas as pd
+
+        return pd.DataFrame(records, columns=["start", "end", "speaker"])
+
+    def _run_asr(
+        self,
+        audio: Any,
+        params: JobCreateParams,
+        model_name: str,
+        device: str,
+        language: str | None,
+        progress_cb: Callable[[int, str, str], None] | None = None,
+        waveform_path: Path | None = None,
+    ) -> Dict[str, Any]:
+        if self._use_long_audio_mode(audio, device):
+            return self._transcribe_chunked(
+                audio, params, model_name, device, language, progress_cb, waveform_path
+            )
+
+        if progress_cb:
+            progress_cb(15, "loading model", f"Loading WhisperX model '{model_name}' on {device}.")
+        model, cache_hit = self._load_asr_model(model_name, device, params.compute_type, language)
+        if cache_hit and progress_cb:
+            progress_cb(15, "loading model", f"Reusing resident WhisperX model '{model_name}'.")
 
         if progress_cb:
             progress_cb(30, "transcribing", "Running speech-to-text transcription.")
-        audio = whisperx.load_audio(str(audio_path))
-        result: Any = model.transcribe(audio, batch_size=params.batch_size)
+        return _run_transcribe(model, audio, params.batch_size, language)
 
+    def _align(
+        self,
+        asr_result: Dict[str, Any],
+        audio: Any,
+        device: str,
+        progress_cb: Callable[[int, str, str], None] | None = None,
+        language: str | None = None,
+    ) -> Dict[str, Any]:
         if progress_cb:
             progress_cb(55, "aligning", "Aligning timestamps for higher accuracy.")
-        align_model, metadata = whisperx.load_align_model(
-            language_code=result["language"],
-            device=device,
-        )
+        (align_model, metadata), _ = self._load_align_model(language or asr_result["language"], device)
         result = whisperx.align(
-            result["segments"],
+            asr_result["segments"],
             align_model,
             metadata,
             audio,
             device,
             return_char_alignments=False,
         )
+        return cast(Dict[str, Any], result)
+
+    def transcribe_batch(
+        self,
+        audio_paths: List[Path],
+        params: JobCreateParams,
+        progress_cb: Callable[[int, str, str], None] | None = None,
+        waveform_paths: List[Path | None] | None = None,
+        device: str | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run ASR for several short recordings in one batched pass.
+
+        Recordings are joined with silent gaps so WhisperX fills its inference batches
+        across files; segments are then split back per recording in local time.
+        Returns one raw ASR result per input, suitable for `transcribe(asr_result=...)`.
+        `device` is the concrete device a slot was acquired on; it overrides `params.device`.
+        """
+        self._prepare_torch_checkpoint_loading()
+        self._patch_torch_load()
+
+        device = self._resolve_device(device or params.device or settings.default_device)
+        model_name = params.model_name or settings.default_model
+        language = params.language or None
+        waveform_paths = waveform_paths or [None] * len(audio_paths)
+
+        audios = [
+            self._load_audio(audio_path, waveform_path)[0]
+            for audio_path, waveform_path in zip(audio_paths, waveform_paths)
+        ]
+        combined, spans = concatenate_with_gaps(audios, _BATCH_GAP_SECONDS)
+
+        if progress_cb:
+            progress_cb(15, "loading model", f"Loading WhisperX model '{model_name}' on {device}.")
+        model, _ = self._load_asr_model(model_name, device, params.compute_type, language)
+        if progress_cb:
+            progress_cb(30, "transcribing", f"Running batched speech-to-text for {len(audios)} recordings.")
+        result: Any = _run_transcribe(model, combined, params.batch_size, language)
+
+        detected = result.get("language") or language
+        return [
+            {"segments": segments, "language": detected}
+            for segments in split_concatenated_segments(result.get("segments", []), spans)
+        ]
+
+    def transcribe(
+        self,
+        audio_path: Path,
+        params: JobCreateParams,
+        progress_cb: Callable[[int, str, str], None] | None = None,
+        hf_token: str | None = None,
+        waveform_path: Path | None = None,
+        asr_result: Dict[str, Any] | None = None,
+        checkpoint_dir: Path | None = None,
+        device: str | None = None,
+    ) -> Dict[str, Any]:
+        self._prepare_torch_checkpoint_loading()
+        self._patch_torch_load()
+
+        requested_device = device or params.device or settings.default_device
+        device = self._resolve_device(requested_device)
+        model_name = params.model_name or settings.default_model
+        language = params.language or None
+
+        effective_hf_token = hf_token if hf_token is not None else settings.hf_token
+        if params.diarization and not effective_hf_token:
+            raise RuntimeError("Diarization requested but HF_TOKEN is not configured.")
+
+        # Each stage's output is checkpointed so an interrupted job resumes where it stopped.
+        checkpoints = StageCheckpoints(checkpoint_dir) if checkpoint_dir else None
+
+        # Decode once; every stage below (and any later re-run) reads the same buffer.
+        audio, waveform_path = self._load_audio(audio_path, waveform_path)
+
+        time_map: TimeMap = []
+        if params.trim_silence:
+            audio, time_map = self._trim_silence(audio, progress_cb, checkpoints)
+            if time_map:
+                # Chunk workers must see the compacted buffer, not the on-disk original.
+                waveform_path = None
+
+        # Saved timestamps are only valid for the same trimmed timeline, so the time map is
+        # part of every audio-derived fingerprint.
+        diarize_fp = fingerprint("diarize", params.trim_silence, time_map)
+        saved_diarization = (
+            checkpoints.load("diarize", diarize_fp) if checkpoints and params.diarization else None
+        )
 
-        if params.diarization:
-            effective_hf_token = hf_token if hf_token is not None else settings.hf_token
-            if not effective_hf_token:
-                raise RuntimeError("Diarization requested but HF_TOKEN is not configured.")
+        # Diarization only needs the audio, so run it alongside ASR and alignment.
+        diarize_executor: ThreadPoolExecutor | None = None
+        diarize_future: Future | None = None
+        if params.diarization and saved_diarization is None:
+            diarize_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarize")
+            diarize_future = diarize_executor.submit(
+                self._diarize, audio, cast(str, effective_hf_token), device
+            )
             if progress_cb:
-                progress_cb(75, "diarizing", "Running speaker diarization.")
-            diarization_pipeline, assign_word_speakers = self._get_diarization_components()
-            try:
-                diarize_model = self._build_diarization_pipeline(
-                    diarization_pipeline, effective_hf_token, device
-                )
-                diarize_raw = diarize_model(str(audio_path))
-                diarize_segments = self._normalize_diarization_output(diarize_raw)
-                result = assign_word_speakers(cast(Any, diarize_segments), cast(Any, result))
-            except Exception:
-                # Keep transcript generation resilient if diarization fails at runtime.
-                if progress_cb:
-                    progress_cb(
-                        82,
-                        "diarizing",
-                        "Diarization failed; continuing without speaker labels.",
-                    )
+                progress_cb(12, "preparing", "Started speaker diarization in parallel.")
+
+        try:
+            asr_fp = fingerprint("asr", model_name, language, params.compute_type, params.trim_silence, time_map)
+            asr_checkpointed = False
+            if asr_result is None and checkpoints:
+                asr_result = checkpoints.load("asr", asr_fp)
+                asr_checkpointed = asr_result is not None
+                if asr_checkpointed and progress_cb:
+                    progress_cb(30, "transcribing", "Reusing saved speech-to-text output.")
+            if asr_result is None:
+                asr_result = self._run_asr(audio, params, model_name, device, language, progress_cb, waveform_path)
+            if checkpoints and not asr_checkpointed:
+                checkpoints.save("asr", asr_fp, asr_result)
+
+            align_language = params.alignment_language or asr_result.get("language")
+            align_fp = fingerprint("align", asr_fp, align_language)
+            result = checkpoints.load("align", align_fp) if checkpoints else None
+            if result is None:
+                result = self._align(asr_result, audio, device, progress_cb, language=align_language)
+                if checkpoints:
+                    checkpoints.save("align", align_fp, result)
+            elif progress_cb:
+                progress_cb(55, "aligning", "Reusing saved alignment.")
+            result["language"] = asr_result.get("language")
+
+            if params.diarization:
+                _, assign_word_speakers = self._get_diarization_components()
+                try:
+                    if saved_diarization is not None:
+                        if progress_cb:
+                            progress_cb(75, "diarizing", "Reusing saved speaker diarization.")
+                        diarize_segments = self._diarization_frame(saved_diarization)
+                    else:
+                        if progress_cb:
+                            progress_cb(75, "diarizing", "Waiting for speaker diarization to finish.")
+                        diarize_segments = cast(Future, diarize_future).result()
+                        if checkpoints:
+                            checkpoints.save("diarize", diarize_fp, self._diarization_records(diarize_segments))
+                    result = assign_word_speakers(cast(Any, diarize_segments), cast(Any, result))
+                except Exception:
+                    # Keep transcript generation resilient if diarization fails at runtime.
+                    if progress_cb:
+                        progress_cb(
+                            82,
+                            "diarizing",
+                            "Diarization failed; continuing without speaker labels.",
+                        )
+        finally:
+            if diarize_executor is not None:
+                # On cancellation or ASR failure, drop a diarization that has not started but
+                # wait out one in flight: it uses the device until it returns, and the caller
+                # releases the job's device slot as soon as this method does.
+                diarize_executor.shutdown(wait=True, cancel_futures=True)
+
+        if time_map:
+            result = remap_result_timestamps(result, time_map)
 
         if progress_cb:
             progress_cb(88, "finalizing", "Finalizing transcript output.")
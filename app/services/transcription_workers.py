@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import multiprocessing as mp
+import os
+import queue
+import signal
+import threading
+import traceback
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Tuple
+
+from app.schemas import JobCreateParams
+from app.services.model_cache import model_cache_budgets, set_model_cache_budgets
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, str, str], None]
+
+
+def _worker_main(
+    conn: Connection,
+    cpu_threads: int | None,
+    warm_params: JobCreateParams | None,
+    budgets_mb: Dict[str, int],
+) -> None:
+    if hasattr(os, "setsid"):
+        # Lead a process group of our own, so a cancel also kills any chunk pool started below.
+        os.setsid()
+
+    # Imported here so the API process does not pay for it when spawning workers.
+    from app.services.transcription_service import TranscriptionService, reserve_chunk_worker_budgets
+
+    set_model_cache_budgets(budgets_mb)
+    reserve_chunk_worker_budgets()
+
+    if cpu_threads:
+        try:
+            import torch
+
+            torch.set_num_threads(cpu_threads)
+        except Exception:
+            pass
+
+    service = TranscriptionService(cpu_threads=cpu_threads)
+    if warm_params is not None:
+        try:
+            service.warm_up(warm_params)
+        except Exception:
+            logger.exception("Transcription worker warm-up failed; models will load on first job.")
+
+    def _progress_cb(progress: int, step: str, event: str) -> None:
+        conn.send(("progress", (progress, step, event)))
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            return
+        if request is None:
+            return
+        method, args, kwargs = request
+        try:
+            value = getattr(service, method)(*args, progress_cb=_progress_cb, **kwargs)
+            conn.send(("result", value))
+        except Exception as exc:
+            conn.send(("error", (type(exc).__name__, str(exc), traceback.format_exc())))
+
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Connection
+
+
+class TranscriptionWorkerPool:
+    """
+    Pre-warmed worker processes that run TranscriptionService methods out of the API process.
+
+    Each worker handles one request at a time over a pipe and streams progress back.
+    Cancelling a job kills its worker's process group (the worker plus any long-audio
+    chunk processes it started) and spawns a fresh worker in its place, so model memory
+    and native threads are released immediately.
+    """
+
+    def __init__(self, size: int, cpu_threads: int | None, warm_params: JobCreateParams | None) -> None:
+        self.size = max(1, size)
+        self.cpu_threads = cpu_threads
+        self.warm_params = warm_params
+        # Each worker holds its own models, so the configured cache budgets are split between them.
+        self.budgets_mb = {pool: budget // self.size for pool, budget in model_cache_budgets().items()}
+        self._ctx = mp.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._busy: Dict[str, _Worker] = {}
+        self._cancelled: set[str] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        # Workers are non-daemonic, so make sure they are told to exit before interpreter shutdown.
+        atexit.register(self.shutdown)
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        logger.info("Started %d transcription worker process(es).", self.size)
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.cpu_threads, self.warm_params, self.budgets_mb),
+            name="steno-transcriber",
+            # Not a daemon: workers may spawn their own pool for long-audio chunking.
+            # They exit on their own when the parent end of the pipe closes.
+            daemon=False,
+        )
+        process.start()
+        # Drop our copy of the child end so a dead worker surfaces as EOF on recv().
+        child_conn.close()
+        return _Worker(process=process, conn=parent_conn)
+
+    def run(
+        self,
+        job_id: str,
+        method: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any] | None = None,
+        progress_cb: ProgressCallback | None = None,
+    ) -> Any:
+        """Run `TranscriptionService.<method>` in a worker process; blocks until it finishes."""
+        worker = self._idle.get()
+        with self._lock:
+            self._busy[job_id] = worker
+            self._cancelled.discard(job_id)
+
+        healthy = False
+        try:
+            worker.conn.send((method, args, kwargs or {}))
+            while True:
+                try:
+                    kind, payload = worker.conn.recv()
+                except (EOFError, OSError) as exc:
+                    if job_id in self._cancelled:
+                        raise asyncio.CancelledError("Cancellation requested by user.") from exc
+                    raise RuntimeError("Transcription worker exited unexpectedly.") from exc
+
+                if kind == "progress":
+                    if progress_cb:
+                        try:
+                            progress_cb(*payload)
+                        except asyncio.CancelledError:
+                            self.cancel(job_id)
+                            raise
+                    continue
+                healthy = True
+                if kind == "result":
+                    return payload
+                name, message, tb = payload
+                logger.debug("Transcription worker error:\n%s", tb)
+                raise RuntimeError(message or name)
+        finally:
+            with self._lock:
+                self._busy.pop(job_id, None)
+                replaced = job_id in self._cancelled
+                self._cancelled.discard(job_id)
+            if replaced:
+                worker.conn.close()
+            elif healthy:
+                self._idle.put(worker)
+            else:
+                self._terminate(worker)
+                self._respawn()
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            worker = self._busy.get(job_id)
+            if worker is None or job_id in self._cancelled:
+                return False
+            self._cancelled.add(job_id)
+        logger.info("Killing transcription worker pid=%s for job %s.", worker.process.pid, job_id)
+        # The thread blocked in run() sees EOF once the process is gone and closes the pipe.
+        self._kill(worker)
+        self._respawn()
+        return True
+
+    def _respawn(self) -> None:
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    @staticmethod
+    def _kill(worker: _Worker) -> None:
+        pid = worker.process.pid
+        if pid and hasattr(os, "killpg"):
+            try:
+                # The worker leads its own group; this takes its long-audio chunk processes with it.
+                os.killpg(pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass  # exited already, or killed before it could call setsid
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(timeout=5)
+
+    def _terminate(self, worker: _Worker) -> None:
+        try:
+            self._kill(worker)
+        finally:
+            worker.conn.close()
+
+    def shutdown(self) -> None:
+        self._closed = True
+        with self._lock:
+            busy = list(self._busy.values())
+        for worker in busy:
+            self._kill(worker)
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.conn.send(None)
+                worker.process.join(timeout=5)
+            except (OSError, ValueError):
+                pass
+            self._terminate(worker)
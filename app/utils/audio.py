@@ -0,0 +1,353 @@
+"""Waveform helpers for splitting, trimming, and batching recordings and remapping their results."""
+
+import os
+import subprocess
+import wave
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+# Raw 16 kHz mono s16le: half the size of float32, and FFmpeg streams it straight to disk.
+WAVEFORM_FILENAME = "waveform.pcm"
+_FRAME_SECONDS = 0.02
+
+
+def is_model_pcm_wav(path: Path) -> bool:
+    """Whether `path` is a WAV of 16 kHz mono 16-bit PCM, which needs no decoding at all."""
+    try:
+        with wave.open(str(path), "rb") as wav:
+            return (
+                wav.getframerate() == SAMPLE_RATE
+                and wav.getnchannels() == 1
+                and wav.getsampwidth() == 2
+                and wav.getcomptype() == "NONE"
+            )
+    except (OSError, EOFError, wave.Error):
+        return False
+
+
+def load_waveform(path: Path) -> np.ndarray:
+    """Memory-map 16 kHz mono int16 samples: a raw waveform file, or the data of a model-ready WAV."""
+    if path.suffix != ".wav":
+        offset, frames = 0, path.stat().st_size // 2
+    else:
+        with path.open("rb") as f, wave.open(f, "rb") as wav:
+            # The header parser stops right after the data chunk header.
+            offset, frames = f.tell(), wav.getnframes()
+    if frames == 0:
+        return np.zeros(0, dtype="<i2")  # mmap refuses empty ranges
+    return np.memmap(path, dtype="<i2", mode="r", offset=offset, shape=(frames,))
+
+
+def pcm_to_float(samples: np.ndarray) -> np.ndarray:
+    """Scale int16 samples to float32 in [-1, 1), exactly as whisperx.load_audio does."""
+    return np.multiply(samples, 1 / 32768, dtype=np.float32)
+
+
+def decode_to_pcm(source: Path, target: Path, ffmpeg_binary: str = "ffmpeg") -> None:
+    """Decode any audio or video file to raw 16 kHz mono s16le, written by FFmpeg directly to `target`."""
+    cmd = [
+        ffmpeg_binary,
+        "-nostdin",
+        "-y",
+        "-threads",
+        "0",
+        "-i",
+        str(source),
+        "-vn",
+        "-f",
+        "s16le",
+        "-ac",
+        "1",
+        "-acodec",
+        "pcm_s16le",
+        "-ar",
+        str(SAMPLE_RATE),
+        str(target),
+    ]
+    try:
+        proc = subprocess.run(cmd, check=False, capture_output=True)
+    except OSError as exc:
+        raise RuntimeError(f"FFmpeg decode failed: {exc}") from exc
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg decode failed: {proc.stderr.decode('utf-8', errors='replace')}")
+
+
+def ensure_waveform(audio_path: Path, waveform_path: Path, decode: Callable[[Path, Path], None]) -> Path:
+    """
+    Path of the job's 16 kHz mono PCM, decoding `audio_path` into `waveform_path` at most once.
+
+    A model-ready WAV upload is used in place. Everything else is decoded on first use
+    and memory-mapped by every later call, so ASR, alignment, diarization, chunk
+    workers and re-runs share one decode.
+    """
+    if is_model_pcm_wav(audio_path):
+        return audio_path
+    if not waveform_path.exists():
+        waveform_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = waveform_path.with_name(f".{waveform_path.name}.tmp")
+        try:
+            decode(audio_path, tmp_path)
+            os.replace(tmp_path, waveform_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    return waveform_path
+
+
+def _frame_energy(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    frame = max(1, int(sample_rate * _FRAME_SECONDS))
+    usable = (len(audio) // frame) * frame
+    if usable == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = np.asarray(audio[:usable], dtype=np.float32).reshape(-1, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def find_silence_boundaries(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    search_seconds: float = 30.0,
+    sample_rate: int = SAMPLE_RATE,
+) -> List[int]:
+    """
+    Pick chunk boundaries (in samples) close to every `chunk_seconds`, snapped to the
+    quietest half-second within `search_seconds` of each target.
+
+    Returns the interior boundaries only; an empty list means the audio fits one chunk.
+    """
+    total_seconds = len(audio) / sample_rate
+    if chunk_seconds <= 0 or total_seconds <= chunk_seconds:
+        return []
+
+    energy = _frame_energy(audio, sample_rate)
+    # Smooth over ~0.5s so we land in sustained pauses rather than single quiet frames.
+    window = max(1, int(0.5 / _FRAME_SECONDS))
+    smoothed = np.convolve(energy, np.ones(window, dtype=np.float32) / window, mode="same")
+
+    boundaries: List[int] = []
+    previous = 0.0
+    target = chunk_seconds
+    while target < total_seconds - chunk_seconds * 0.25:
+        lo = max(previous + chunk_seconds * 0.5, target - search_seconds)
+        hi = min(total_seconds, target + search_seconds)
+        lo_frame = int(lo / _FRAME_SECONDS)
+        hi_frame = max(lo_frame + 1, int(hi / _FRAME_SECONDS))
+        window_energy = smoothed[lo_frame:hi_frame]
+        if len(window_energy) == 0:
+            break
+        best = (lo_frame + int(np.argmin(window_energy))) * _FRAME_SECONDS
+        boundaries.append(int(best * sample_rate))
+        previous = best
+        target = best + chunk_seconds
+    return boundaries
+
+
+def plan_chunks(
+    total_samples: int,
+    boundaries: Sequence[int],
+    overlap_seconds: float,
+    sample_rate: int = SAMPLE_RATE,
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Turn boundaries into `(read_start, read_end, own_start, own_end)` sample ranges.
+
+    Each chunk is read with `overlap_seconds` of context on both sides but only
+    "owns" the span between its boundaries; stitching keeps segments by ownership.
+    """
+    overlap = int(overlap_seconds * sample_rate)
+    edges = [0, *boundaries, total_samples]
+    chunks = []
+    for own_start, own_end in zip(edges[:-1], edges[1:]):
+        chunks.append(
+            (
+                max(0, own_start - overlap),
+                min(total_samples, own_end + overlap),
+                own_start,
+                own_end,
+            )
+        )
+    return chunks
+
+
+def stitch_chunk_segments(
+    chunk_results: Sequence[Tuple[int, int, int, List[Dict[str, Any]]]],
+    sample_rate: int = SAMPLE_RATE,
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-chunk segments `(read_start, own_start, own_end, segments)` into one
+    timeline: shift timestamps by the chunk offset, keep only segments that start
+    inside the chunk's owned span, and drop duplicates left by the overlap.
+    """
+    stitched: List[Dict[str, Any]] = []
+    for read_start, own_start, own_end, segments in chunk_results:
+        offset = read_start / sample_rate
+        own_lo = own_start / sample_rate
+        own_hi = own_end / sample_rate
+        for seg in segments:
+            shifted = dict(seg)
+            shifted["start"] = float(seg.get("start", 0.0)) + offset
+            shifted["end"] = float(seg.get("end", 0.0)) + offset
+            if not own_lo <= shifted["start"] < own_hi:
+                continue
+            if stitched and _is_duplicate(stitched[-1], shifted):
+                continue
+            stitched.append(shifted)
+    stitched.sort(key=lambda s: s["start"])
+    return stitched
+
+
+def _is_duplicate(previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    if current["start"] >= previous["end"]:
+        return False
+    return (previous.get("text") or "").strip() == (current.get("text") or "").strip()
+
+
+def detect_speech_spans(
+    audio: np.ndarray,
+    min_silence_seconds: float = 1.0,
+    padding_seconds: float = 0.25,
+    sample_rate: int = SAMPLE_RATE,
+) -> List[Tuple[int, int]]:
+    """
+    Energy-based voice activity: return `(start, end)` sample spans that are not silence.
+
+    Frames are silent when their RMS stays below a threshold derived from the noise
+    floor; only pauses longer than `min_silence_seconds` are cut, and every kept span
+    is padded so word onsets and tails survive.
+    """
+    energy = _frame_energy(audio, sample_rate)
+    if len(energy) == 0:
+        return [(0, len(audio))] if len(audio) else []
+
+    noise_floor = float(np.percentile(energy, 10))
+    # -45 dBFS absolute floor, or clearly above the recording's own background level.
+    threshold = max(10 ** (-45 / 20), noise_floor * 3.0)
+    voiced = energy > threshold
+
+    spans: List[Tuple[int, int]] = []
+    frame = int(sample_rate * _FRAME_SECONDS)
+    min_gap = int(min_silence_seconds / _FRAME_SECONDS)
+    pad = int(padding_seconds * sample_rate)
+
+    start_frame: int | None = None
+    last_voiced = -1
+    for index in np.flatnonzero(voiced):
+        index = int(index)
+        if start_frame is None:
+            start_frame = index
+        elif index - last_voiced > min_gap:
+            spans.append((start_frame, last_voiced + 1))
+            start_frame = index
+        last_voiced = index
+    if start_frame is not None:
+        spans.append((start_frame, last_voiced + 1))
+
+    padded: List[Tuple[int, int]] = []
+    for start, end in spans:
+        lo = max(0, start * frame - pad)
+        hi = min(len(audio), end * frame + pad)
+        if padded and lo <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], hi)
+        else:
+            padded.append((lo, hi))
+    return padded
+
+
+TimeMap = List[Tuple[float, float]]
+
+
+def compact_audio(
+    audio: np.ndarray,
+    spans: Sequence[Tuple[int, int]],
+    sample_rate: int = SAMPLE_RATE,
+) -> Tuple[np.ndarray, TimeMap]:
+    """
+    Concatenate the kept spans and return the compacted audio plus a time map of
+    `(compact_start, original_start)` pairs, in seconds, one per span.
+    """
+    pieces = []
+    time_map: TimeMap = []
+    cursor = 0
+    for start, end in spans:
+        time_map.append((cursor / sample_rate, start / sample_rate))
+        pieces.append(np.asarray(audio[start:end], dtype=np.float32))
+        cursor += end - start
+    compact = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+    return compact, time_map
+
+
+def to_original_time(seconds: float, time_map: TimeMap, end: bool = False) -> float:
+    """
+    Map a compacted timestamp back to original time. A time exactly on a span boundary
+    is both the end of one span and the start of the next; `end=True` picks the former.
+    """
+    if not time_map:
+        return seconds
+    compact_starts = [c for c, _ in time_map]
+    position = bisect_left(compact_starts, seconds) if end else bisect_right(compact_starts, seconds)
+    index = max(0, position - 1)
+    compact_start, original_start = time_map[index]
+    return original_start + (seconds - compact_start)
+
+
+def remap_result_timestamps(result: Dict[str, Any], time_map: TimeMap) -> Dict[str, Any]:
+    """Map segment and word `start`/`end` values from compacted time back to original time."""
+    if not time_map:
+        return result
+
+    def _remap(item: Dict[str, Any]) -> None:
+        for key in ("start", "end"):
+            if isinstance(item.get(key), (int, float)):
+                item[key] = round(to_original_time(float(item[key]), time_map, end=key == "end"), 3)
+
+    for seg in result.get("segments", []):
+        _remap(seg)
+        for word in seg.get("words", []) or []:
+            _remap(word)
+    for word in result.get("word_segments", []) or []:
+        _remap(word)
+    return result
+
+
+def concatenate_with_gaps(
+    audios: Sequence[np.ndarray],
+    gap_seconds: float,
+    sample_rate: int = SAMPLE_RATE,
+) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """Join recordings with silent gaps; return the buffer and each recording's `(start, end)` samples."""
+    gap = np.zeros(int(gap_seconds * sample_rate), dtype=np.float32)
+    pieces: List[np.ndarray] = []
+    spans: List[Tuple[int, int]] = []
+    cursor = 0
+    for index, audio in enumerate(audios):
+        if index:
+            pieces.append(gap)
+            cursor += len(gap)
+        pieces.append(np.asarray(audio, dtype=np.float32))
+        spans.append((cursor, cursor + len(audio)))
+        cursor += len(audio)
+    combined = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+    return combined, spans
+
+
+def split_concatenated_segments(
+    segments: Sequence[Dict[str, Any]],
+    spans: Sequence[Tuple[int, int]],
+    sample_rate: int = SAMPLE_RATE,
+) -> List[List[Dict[str, Any]]]:
+    """Assign segments of a concatenated transcription back to their recordings, in local time."""
+    starts = [start / sample_rate for start, _ in spans]
+    per_item: List[List[Dict[str, Any]]] = [[] for _ in spans]
+    for seg in segments:
+        seg_start = float(seg.get("start", 0.0))
+        index = max(0, bisect_right(starts, seg_start) - 1)
+        offset = starts[index]
+        duration = (spans[index][1] - spans[index][0]) / sample_rate
+        local = dict(seg)
+        local["start"] = max(0.0, seg_start - offset)
+        local["end"] = min(duration, float(seg.get("end", seg_start)) - offset)
+        per_item[index].append(local)
+    return per_item
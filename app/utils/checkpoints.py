@@ -0,0 +1,55 @@
+"""Per-job pipeline stage checkpoints stored as JSON files in the job directory."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from app.utils.serialization import json_default
+
+CHECKPOINT_DIRNAME = "checkpoints"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable digest of the inputs a stage depends on; a mismatch invalidates the checkpoint."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class StageCheckpoints:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _path(self, stage: str) -> Path:
+        return self.directory / f"{stage}.json"
+
+    def load(self, stage: str, expected_fingerprint: str) -> Any | None:
+        """
+        Return the stage's saved output, or None when it is missing, unreadable, or was
+        produced from different inputs.
+        """
+        try:
+            raw = json.loads(self._path(stage).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if raw.get("fingerprint") != expected_fingerprint:
+            return None
+        return raw.get("data")
+
+    def save(self, stage: str, stage_fingerprint: str, data: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        p = self._path(stage)
+        tmp = p.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"fingerprint": stage_fingerprint, "data": data}, ensure_ascii=False, default=json_default),
+            encoding="utf-8",
+        )
+        os.replace(tmp, p)
+
+    def exists(self, stage: str) -> bool:
+        return self._path(stage).exists()
+
+    def invalidate(self, stages: Iterable[str]) -> None:
+        for stage in stages:
+            self._path(stage).unlink(missing_ok=True)
@@ -0,0 +1,331 @@
+"""Compact per-job transcript segments: columnar numpy arrays plus UTF-8 text blobs, memory-mapped on read."""
+
+import json
+import math
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, overload
+
+import numpy as np
+
+from app.utils.serialization import json_default
+
+SEGMENTS_DIRNAME = "segments"
+_FORMAT_VERSION = 1
+_SEGMENT_KEYS = {"start", "end", "text", "speaker", "words"}
+
+
+def _encode_texts(texts: Sequence[str]) -> tuple[bytes, np.ndarray]:
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return b"".join(encoded), offsets
+
+
+def _float_or_nan(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) else math.nan
+
+
+class _TimeIndex:
+    """
+    Lookup columns behind `select_segments`, built once per segment set.
+
+    `order` sorts segments by start time (None when they already are), `reach` is the
+    running maximum of end times in that order (untimed ends count as -inf), and
+    `speaker_positions` lists time-order positions grouped by speaker code, with group
+    `code` at `speaker_offsets[code + 1]:speaker_offsets[code + 2]` (code -1 is unlabelled).
+    """
+
+    COLUMNS = ("seg_order", "seg_reach", "speaker_positions", "speaker_offsets")
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        order: np.ndarray | None,
+        reach: np.ndarray,
+        speaker_positions: np.ndarray,
+        speaker_offsets: np.ndarray,
+    ) -> None:
+        self.starts = starts
+        self.ends = ends
+        self.order = order
+        self.reach = reach
+        self.speaker_positions = speaker_positions
+        self.speaker_offsets = speaker_offsets
+
+    @classmethod
+    def build(cls, starts: np.ndarray, ends: np.ndarray, speaker_codes: np.ndarray, speaker_count: int) -> "_TimeIndex":
+        # Pipelines emit segments in time order; only sort when they are not (NaN compares false).
+        order = None
+        if len(starts) > 1 and not bool(np.all(starts[1:] >= starts[:-1])):
+            order = np.argsort(starts, kind="stable")
+        in_time = (lambda column: column[order]) if order is not None else (lambda column: column)
+        timed_ends = np.where(np.isnan(ends), -np.inf, ends)
+        reach = np.maximum.accumulate(in_time(timed_ends)) if len(ends) else timed_ends
+        codes = in_time(np.asarray(speaker_codes, dtype=np.int64))
+        speaker_positions = np.argsort(codes, kind="stable").astype(np.int64)
+        speaker_offsets = np.zeros(speaker_count + 2, dtype=np.int64)
+        speaker_offsets[1:] = np.cumsum(np.bincount(codes + 1, minlength=speaker_count + 1))
+        return cls(starts, ends, order, reach, speaker_positions, speaker_offsets)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        columns = {
+            "seg_reach": self.reach,
+            "speaker_positions": self.speaker_positions,
+            "speaker_offsets": self.speaker_offsets,
+        }
+        if self.order is not None:
+            columns["seg_order"] = self.order
+        return columns
+
+    def select(self, start: float | None, end: float | None, speaker_code: int | None) -> np.ndarray:
+        lo, hi = 0, len(self.starts)
+        if end is not None:
+            hi = int(np.searchsorted(self.starts, end, side="left", sorter=self.order))
+        if start is not None:
+            lo = int(np.searchsorted(self.reach, start, side="right"))
+        if speaker_code is None:
+            picked = np.arange(lo, max(lo, hi))
+        else:
+            group = self.speaker_positions[self.speaker_offsets[speaker_code + 1] : self.speaker_offsets[speaker_code + 2]]
+            picked = np.asarray(group[np.searchsorted(group, lo) : np.searchsorted(group, max(lo, hi))])
+        if self.order is not None:
+            picked = self.order[picked]
+        if start is not None:
+            # Short segments nested inside a long one can end before the window opens (NaN never passes).
+            picked = picked[self.ends[picked] > start]
+        return picked
+
+
+def write_segments(directory: Path, segments: Sequence[Dict[str, Any]]) -> None:
+    """
+    Write segments (and their word timings) as a column set under `directory`.
+
+    Fields outside the known WhisperX keys are kept per index in `meta.json` so
+    nothing is lost; the common fields cost a few bytes per segment/word.
+    """
+    speakers: Dict[str, int] = {}
+
+    def speaker_id(value: Any) -> int:
+        if not isinstance(value, str) or not value:
+            return -1
+        return speakers.setdefault(value, len(speakers))
+
+    seg_start, seg_end, seg_speaker, seg_texts, seg_word_offsets = [], [], [], [], [0]
+    word_start, word_end, word_score, word_speaker, word_texts = [], [], [], [], []
+    extras: Dict[str, Dict[str, Any]] = {}
+    for index, seg in enumerate(segments):
+        seg_start.append(_float_or_nan(seg.get("start")))
+        seg_end.append(_float_or_nan(seg.get("end")))
+        seg_speaker.append(speaker_id(seg.get("speaker")))
+        seg_texts.append(str(seg.get("text") or ""))
+        for word in seg.get("words") or []:
+            word_start.append(_float_or_nan(word.get("start")))
+            word_end.append(_float_or_nan(word.get("end")))
+            word_score.append(_float_or_nan(word.get("score")))
+            word_speaker.append(speaker_id(word.get("speaker")))
+            word_texts.append(str(word.get("word") or ""))
+        seg_word_offsets.append(len(word_texts))
+        extra = {k: v for k, v in seg.items() if k not in _SEGMENT_KEYS}
+        if extra:
+            extras[str(index)] = extra
+
+    text_blob, text_offsets = _encode_texts(seg_texts)
+    word_blob, word_text_offsets = _encode_texts(word_texts)
+    columns = {
+        "seg_start": np.asarray(seg_start, dtype=np.float64),
+        "seg_end": np.asarray(seg_end, dtype=np.float64),
+        "seg_speaker": np.asarray(seg_speaker, dtype=np.int32),
+        "seg_text_offsets": text_offsets,
+        "seg_word_offsets": np.asarray(seg_word_offsets, dtype=np.int64),
+        "word_start": np.asarray(word_start, dtype=np.float64),
+        "word_end": np.asarray(word_end, dtype=np.float64),
+        "word_score": np.asarray(word_score, dtype=np.float64),
+        "word_speaker": np.asarray(word_speaker, dtype=np.int32),
+        "word_text_offsets": word_text_offsets,
+    }
+    time_index = _TimeIndex.build(columns["seg_start"], columns["seg_end"], columns["seg_speaker"], len(speakers))
+    columns.update(time_index.columns())
+
+    # Build beside the target and swap in, so readers never see a half-written set.
+    tmp_dir = directory.with_name(f".{directory.name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for name, array in columns.items():
+        np.save(tmp_dir / f"{name}.npy", array)
+    (tmp_dir / "text.bin").write_bytes(text_blob)
+    (tmp_dir / "words.bin").write_bytes(word_blob)
+    meta = {
+        "version": _FORMAT_VERSION,
+        "count": len(seg_texts),
+        "speakers": list(speakers),
+    }
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    if extras:
+        # Kept out of meta.json so opening a set for a time window never parses them.
+        (tmp_dir / "extras.json").write_text(json.dumps(extras, ensure_ascii=False, default=json_default), encoding="utf-8")
+
+    old_dir = directory.with_name(f".{directory.name}.old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if directory.exists():
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _load_blob(path: Path) -> Any:
+    if path.stat().st_size == 0:
+        return b""
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+
+class SegmentArtifact(Sequence[Dict[str, Any]]):
+    """Read-only, memory-mapped view of segments written by `write_segments`; dicts are built on access."""
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        self._count = int(meta["count"])
+        self._speakers: List[str] = meta["speakers"]
+        self._speaker_codes = {name: code for code, name in enumerate(self._speakers)}
+        # Loaded from `extras.json` on first segment read.
+        self._extras: Dict[str, Dict[str, Any]] | None = None
+
+        def column(name: str) -> np.ndarray:
+            return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+        self._seg_start = column("seg_start")
+        self._seg_end = column("seg_end")
+        self._seg_speaker = column("seg_speaker")
+        self._seg_text_offsets = column("seg_text_offsets")
+        self._seg_word_offsets = column("seg_word_offsets")
+        self._word_start = column("word_start")
+        self._word_end = column("word_end")
+        self._word_score = column("word_score")
+        self._word_speaker = column("word_speaker")
+        self._word_text_offsets = column("word_text_offsets")
+        self._text = _load_blob(directory / "text.bin")
+        self._words = _load_blob(directory / "words.bin")
+
+        self._time_index = _TimeIndex(
+            self._seg_start,
+            self._seg_end,
+            column("seg_order") if (directory / "seg_order.npy").exists() else None,
+            column("seg_reach"),
+            column("speaker_positions"),
+            column("speaker_offsets"),
+        )
+
+    def select(self, start: float | None = None, end: float | None = None, speaker: str | None = None) -> np.ndarray:
+        """See `select_segments`."""
+        if speaker is None:
+            return self._time_index.select(start, end, None)
+        if speaker not in self._speaker_codes:
+            return np.zeros(0, dtype=np.int64)
+        return self._time_index.select(start, end, self._speaker_codes[speaker])
+
+    def _segment_extras(self, index: int) -> Dict[str, Any]:
+        if self._extras is None:
+            path = self._directory / "extras.json"
+            self._extras = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        return self._extras.get(str(index), {})
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> Dict[str, Any] | List[Dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self._segment(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("segment index out of range")
+        return self._segment(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self._count):
+            yield self._segment(index)
+
+    def _speaker(self, code: int) -> str | None:
+        return self._speakers[code] if code >= 0 else None
+
+    def _segment(self, index: int) -> Dict[str, Any]:
+        seg: Dict[str, Any] = {}
+        _set_number(seg, "start", self._seg_start[index])
+        _set_number(seg, "end", self._seg_end[index])
+        lo, hi = self._seg_text_offsets[index], self._seg_text_offsets[index + 1]
+        seg["text"] = bytes(self._text[lo:hi]).decode("utf-8")
+        speaker = self._speaker(int(self._seg_speaker[index]))
+        if speaker is not None:
+            seg["speaker"] = speaker
+        first, last = int(self._seg_word_offsets[index]), int(self._seg_word_offsets[index + 1])
+        if last > first:
+            seg["words"] = [self._word(w) for w in range(first, last)]
+        seg.update(self._segment_extras(index))
+        return seg
+
+    def _word(self, index: int) -> Dict[str, Any]:
+        lo, hi = self._word_text_offsets[index], self._word_text_offsets[index + 1]
+        word: Dict[str, Any] = {"word": bytes(self._words[lo:hi]).decode("utf-8")}
+        _set_number(word, "start", self._word_start[index])
+        _set_number(word, "end", self._word_end[index])
+        _set_number(word, "score", self._word_score[index])
+        speaker = self._speaker(int(self._word_speaker[index]))
+        if speaker is not None:
+            word["speaker"] = speaker
+        return word
+
+
+def _set_number(item: Dict[str, Any], key: str, value: float) -> None:
+    if not math.isnan(value):
+        item[key] = float(value)
+
+
+def select_segments(
+    segments: Sequence[Dict[str, Any]],
+    start: float | None = None,
+    end: float | None = None,
+    speaker: str | None = None,
+) -> np.ndarray:
+    """
+    Indices of the segments overlapping `[start, end)` seconds (and spoken by `speaker`),
+    in time order.
+
+    For a segment artifact the time order, running maximum of end times and
+    per-speaker positions are stored columns written by `write_segments`, so a
+    window costs a few binary searches plus a pass over its candidates: segments
+    starting before `end` and after the last one to end before `start`. Plain
+    lists build that index on every call.
+    """
+    if isinstance(segments, SegmentArtifact):
+        return segments.select(start, end, speaker)
+
+    speakers: Dict[str, int] = {}
+    codes = [speakers.setdefault(seg["speaker"], len(speakers)) if seg.get("speaker") else -1 for seg in segments]
+    time_index = _TimeIndex.build(
+        np.array([_float_or_nan(seg.get("start")) for seg in segments], dtype=np.float64),
+        np.array([_float_or_nan(seg.get("end")) for seg in segments], dtype=np.float64),
+        np.array(codes, dtype=np.int64),
+        len(speakers),
+    )
+    if speaker is not None and speaker not in speakers:
+        return np.zeros(0, dtype=np.int64)
+    return time_index.select(start, end, speakers[speaker] if speaker is not None else None)
+
+
+def load_segments(directory: Path) -> SegmentArtifact | None:
+    if not (directory / "meta.json").exists():
+        return None
+    try:
+        return SegmentArtifact(directory)
+    except (OSError, ValueError, KeyError):
+        return None
@@ -0,0 +1,12 @@
+"""JSON helpers shared by the on-disk stores (checkpoints, segment artifacts, transcript cache)."""
+
+from typing import Any
+
+
+def json_default(value: Any) -> Any:
+    """`json.dumps` fallback for the numpy scalars and arrays WhisperX/pyannote outputs can carry."""
+    if hasattr(value, "item") and getattr(value, "ndim", 0) == 0:
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -1,14 +1,14 @@
 """Utility functions for speaker name transformations."""
 
 import re
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 
 # Pattern to match typical diarization speaker labels like SPEAKER_00, SPEAKER_01, etc.
 _SPEAKER_ID_PATTERN = re.compile(r"^SPEAKER_\d{2}$", re.IGNORECASE)
 
 
-def _normalize_overrides(overrides: Dict[str, str]) -> Dict[str, str]:
+def normalize_speaker_name_overrides(overrides: Dict[str, str]) -> Dict[str, str]:
     """
     Normalize speaker name overrides to ensure raw speaker IDs map to custom names.
 
@@ -55,20 +55,33 @@ def apply_speaker_name_overrides(
     if not overrides:
         return segments
 
-    normalized = _normalize_overrides(overrides)
+    normalized = normalize_speaker_name_overrides(overrides)
     if not normalized:
         return segments
 
-    result = []
+    return list(iter_speaker_name_overrides(segments, overrides))
+
+
+def iter_speaker_name_overrides(
+    segments: Iterable[Dict[str, Any]], overrides: Dict[str, str] | None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazy form of `apply_speaker_name_overrides` for streaming long transcripts.
+
+    Segments are yielded unchanged when there are no usable overrides.
+    """
+    normalized = normalize_speaker_name_overrides(overrides or {})
     for seg in segments:
+        if not normalized:
+            yield seg
+            continue
         seg_copy = dict(seg)
         raw_speaker = seg_copy.get("speaker", "")
         if isinstance(raw_speaker, str) and raw_speaker.strip():
             custom_name = normalized.get(raw_speaker.strip())
             if custom_name and isinstance(custom_name, str) and custom_name.strip():
                 seg_copy["speaker"] = custom_name.strip()
-        result.append(seg_copy)
-    return result
+        yield seg_copy
 
 
 def build_transcript_with_custom_speakers(
@@ -89,7 +102,7 @@ def build_transcript_with_custom_speakers(
     if not segments:
         return ""
 
-    normalized = _normalize_overrides(overrides)
+    normalized = normalize_speaker_name_overrides(overrides)
 
     lines = []
     for seg in segments:
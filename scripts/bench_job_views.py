@@ -0,0 +1,107 @@
+"""
+Measure what `GET /api/jobs/{job_id}` costs per view on long transcripts.
+
+Builds synthetic finished jobs (one segment every ~5 s of audio, ~12 aligned words
+each), stores their segments the way the pipeline does, and times building plus
+JSON-encoding each response body. Nothing is written outside a temporary directory.
+
+    python scripts/bench_job_views.py --hours 1 4 8 --repeat 5
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.api.routes import _SUMMARY_VIEW_FIELDS, _job_status_fields, _job_status_response  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.schemas import JobCreateParams, JobState  # noqa: E402
+from app.services.job_service import JobService  # noqa: E402
+
+_WORDS = "the meeting agreed to move the release forward after reviewing open issues and budget".split()
+
+
+def synthetic_segments(hours: float, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    segments: List[Dict[str, Any]] = []
+    t = 0.0
+    while t < hours * 3600:
+        speaker = f"SPEAKER_{rng.randrange(4):02d}"
+        words = []
+        for _ in range(rng.randint(8, 16)):
+            duration = rng.uniform(0.15, 0.45)
+            words.append(
+                {"word": rng.choice(_WORDS), "start": round(t, 3), "end": round(t + duration, 3), "score": round(rng.random(), 3), "speaker": speaker}
+            )
+            t += duration + rng.uniform(0.0, 0.1)
+        segments.append(
+            {
+                "start": words[0]["start"],
+                "end": words[-1]["end"],
+                "text": " ".join(w["word"] for w in words),
+                "speaker": speaker,
+                "words": words,
+            }
+        )
+        t += rng.uniform(0.2, 1.5)
+    return segments
+
+
+def time_view(build: Callable[[], Dict[str, Any]], repeat: int) -> tuple[float, int]:
+    timings, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = JSONResponse(build()).body
+        timings.append(time.perf_counter() - started)
+        size = len(body)
+    return statistics.median(timings) * 1000, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, nargs="+", default=[1.0, 4.0, 8.0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.jobs_dir = Path(tmp) / "jobs"
+        settings.jobs_db_path = Path(tmp) / "jobs.db"
+        service = JobService()
+        views: Dict[str, Callable[[JobState], Dict[str, Any]]] = {
+            "full": lambda job: _job_status_response(job, service, None).model_dump(mode="json"),
+            "summary": lambda job: _job_status_fields(job, service, _SUMMARY_VIEW_FIELDS, None),
+            "fields=status,progress,step": lambda job: _job_status_fields(job, service, ["id", "status", "progress", "step"], None),
+        }
+
+        print(f"{'hours':>6} {'segments':>9} {'view':<30} {'median ms':>10} {'bytes':>12}")
+        for hours in args.hours:
+            segments = synthetic_segments(hours)
+            job = JobState(
+                id=f"bench-{hours:g}h",
+                filename="bench.wav",
+                source_path="",
+                audio_path="",
+                file_type="audio",
+                status="completed",
+                progress=100,
+                step="done",
+                params=JobCreateParams(),
+            )
+            job.result.transcript = "\n".join(seg["text"] for seg in segments)
+            service._store_segments(job, segments)
+            for name, build in views.items():
+                ms, size = time_view(lambda: build(job), args.repeat)
+                print(f"{hours:>6g} {len(segments):>9} {name:<30} {ms:>10.2f} {size:>12,}")
+        service.store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,11 @@ const state = {
   recordingTimer: null,
   activeJobId: null,
   pollTimer: null,
+  jobStream: null,
+  jobsStream: null,
   jobs: [],
+  jobCounts: {},
+  jobsCursor: null,
   audioUrl: null,
   deleteCandidateId: null,
   globalSettings: null,
@@ -83,6 +87,7 @@ const refs = {
   compute_type: el("compute_type"),
   batch_size: el("batch_size"),
   diarization: el("diarization"),
+  trim_silence: el("trim_silence"),
   summary_enabled: el("summary_enabled"),
   summary_style: el("summary_style"),
   formatList: el("format-list"),
@@ -1081,8 +1086,13 @@ function selectedFormats() {
   ].map((n) => n.value);
 }
 
-async function fetchJobs() {
-  const res = await fetch("/api/jobs");
+const JOBS_PAGE_SIZE = 50;
+
+async function fetchJobs(cursor = null) {
+  const qs = new URLSearchParams({ limit: String(JOBS_PAGE_SIZE) });
+  if (state.currentTab === "queue") qs.set("status", "queued,processing");
+  if (cursor) qs.set("cursor", cursor);
+  const res = await fetch(`/api/jobs?${qs.toString()}`);
   if (!res.ok) throw new Error("Failed to load jobs");
   return res.json();
 }
@@ -1096,6 +1106,25 @@ function filteredJobs() {
   return state.jobs;
 }
 
+function renderLoadMoreJobs() {
+  if (!state.jobsCursor) return;
+  const btn = document.createElement("button");
+  btn.type = "button";
+  btn.className =
+    "w-full text-xs text-[var(--text-muted)] hover:text-[var(--text-primary)] border border-[var(--border-subtle)] rounded-xl p-2";
+  btn.textContent = "Load more";
+  btn.addEventListener("click", async () => {
+    btn.disabled = true;
+    try {
+      await loadMoreJobs();
+    } catch (e) {
+      setError(e.message);
+      btn.disabled = false;
+    }
+  });
+  refs.sidebarContent.appendChild(btn);
+}
+
 function renderSidebar() {
   const jobs = filteredJobs();
   refs.sidebarContent.innerHTML = "";
@@ -1151,15 +1180,14 @@ function renderSidebar() {
     }
     refs.sidebarContent.appendChild(row);
   });
+  renderLoadMoreJobs();
 }
 
 function updateStats() {
-  refs.completedCount.textContent = String(
-    state.jobs.filter((j) => j.status === "completed").length,
-  );
+  const counts = state.jobCounts || {};
+  refs.completedCount.textContent = String(counts.completed || 0);
   refs.queueCount.textContent = String(
-    state.jobs.filter((j) => j.status === "queued" || j.status === "processing")
-      .length,
+    (counts.queued || 0) + (counts.processing || 0),
   );
 }
 
@@ -1200,6 +1228,12 @@ async function fetchJob(jobId) {
   return res.json();
 }
 
+async function fetchJobChanges(jobId, cursor) {
+  const res = await fetch(`/api/jobs/${jobId}?since=${encodeURIComponent(cursor)}`);
+  if (!res.ok) throw new Error("Failed to load job");
+  return res.json();
+}
+
 function applyJobConfig(job) {
   if (!job.params) return;
   refs.model_name.value = job.params.model_name || refs.model_name.value;
@@ -1208,6 +1242,7 @@ function applyJobConfig(job) {
   refs.device.value = job.params.device || refs.device.value;
   refs.compute_type.value = job.params.compute_type || refs.compute_type.value;
   refs.diarization.checked = !!job.params.diarization;
+  refs.trim_silence.checked = !!job.params.trim_silence;
   refs.summary_enabled.checked = !!job.params.summary_enabled;
   const requestedStyle = normalizeSummaryStyleKey(job.params.summary_style || "");
   if (requestedStyle && !state.summaryPromptTemplates[requestedStyle]) {
@@ -1238,26 +1273,134 @@ async function refreshActiveJob() {
   applyJobConfig(job);
 
   if (job.status === "processing" || job.status === "queued") return;
-  clearInterval(state.pollTimer);
-  state.pollTimer = null;
+  stopActiveJobUpdates();
   await refreshJobs();
 }
 
-async function selectJob(jobId) {
-  state.activeJobId = jobId;
+function stopActiveJobUpdates() {
   clearInterval(state.pollTimer);
   state.pollTimer = null;
-  await refreshActiveJob();
-  const j = await fetchJob(jobId);
-  if (j.status === "processing" || j.status === "queued") {
-    state.pollTimer = setInterval(() => {
+  if (state.jobStream) {
+    state.jobStream.close();
+    state.jobStream = null;
+  }
+}
+
+function pollActiveJob() {
+  stopActiveJobUpdates();
+  state.pollTimer = setInterval(() => {
+    const job = state.activeJobData;
+    if (!job?.cursor) {
       refreshActiveJob().catch((e) => setError(e.message));
-    }, 2000);
+      return;
+    }
+    fetchJobChanges(job.id, job.cursor)
+      .then((changes) => {
+        if (state.activeJobData !== job) return;
+        applyJobChanges(changes, false);
+        if (changes.status === "processing" || changes.status === "queued") return;
+        stopActiveJobUpdates();
+        return refreshActiveJob();
+      })
+      .catch((e) => setError(e.message));
+  }, 2000);
+}
+
+function applyJobChanges(changes, firstMessage) {
+  refs.progressBar.style.width = `${Math.max(0, Math.min(100, changes.progress || 0))}%`;
+  refs.statusText.textContent = `${changes.progress || 0}% - ${changes.step} (${changes.status})`;
+  setError(changes.error || "");
+  const job = state.activeJobData;
+  if (!job || job.id !== changes.id) return;
+  Object.assign(job, {
+    status: changes.status,
+    progress: changes.progress,
+    step: changes.step,
+    error: changes.error,
+    updated_at: changes.updated_at,
+    version: changes.version,
+    cursor: changes.cursor,
+  });
+  // The first message carries the retained log; later ones only what was added.
+  job.events = firstMessage ? changes.events : (job.events || []).concat(changes.events);
+  refreshPreview(job);
+  if (changes.segments.length || changes.segments_revision !== job.result.segments_revision) {
+    const kept = (job.result.segments || []).slice(0, changes.segments_from);
+    job.result.segments = kept.concat(changes.segments);
+    job.result.segment_count = changes.segment_count;
+    job.result.segments_revision = changes.segments_revision;
+    renderTranscriptionOutput(job, state.activeJobResolvedTranscript);
   }
 }
 
+function followActiveJob(jobId) {
+  if (typeof EventSource === "undefined") {
+    pollActiveJob();
+    return;
+  }
+  stopActiveJobUpdates();
+  const stream = new EventSource(`/api/jobs/${encodeURIComponent(jobId)}/stream`);
+  state.jobStream = stream;
+  let firstMessage = true;
+  stream.addEventListener("job", (e) => {
+    if (state.jobStream !== stream) return;
+    const changes = JSON.parse(e.data);
+    applyJobChanges(changes, firstMessage);
+    firstMessage = false;
+    if (changes.status === "processing" || changes.status === "queued") return;
+    stopActiveJobUpdates();
+    refreshActiveJob().catch((err) => setError(err.message));
+  });
+  stream.addEventListener("deleted", () => {
+    if (state.jobStream !== stream) return;
+    stopActiveJobUpdates();
+    refreshJobs().catch((err) => setError(err.message));
+  });
+  stream.onerror = () => {
+    // Proxies that buffer or drop event streams: fall back to polling.
+    if (state.jobStream === stream) pollActiveJob();
+  };
+}
+
+async function selectJob(jobId) {
+  state.activeJobId = jobId;
+  stopActiveJobUpdates();
+  await refreshActiveJob();
+  const job = state.activeJobData;
+  if (state.activeJobId === jobId && (job?.status === "processing" || job?.status === "queued")) {
+    followActiveJob(jobId);
+  }
+}
+
+function followJobList() {
+  if (typeof EventSource === "undefined") return;
+  const stream = new EventSource("/api/jobs/stream");
+  state.jobsStream = stream;
+  stream.addEventListener("jobs", (e) => {
+    const { items, deleted } = JSON.parse(e.data);
+    let listChanged = deleted.some((id) => state.jobs.some((job) => job.id === id));
+    items.forEach((item) => {
+      const index = state.jobs.findIndex((job) => job.id === item.id);
+      if (index === -1 || state.jobs[index].status !== item.status) {
+        // New jobs and status moves change the tabs, ordering, and counts.
+        listChanged = true;
+      } else {
+        state.jobs[index] = item;
+      }
+    });
+    if (listChanged) {
+      refreshJobs().catch((err) => setError(err.message));
+    } else {
+      renderSidebar();
+    }
+  });
+}
+
 async function refreshJobs() {
-  state.jobs = await fetchJobs();
+  const page = await fetchJobs();
+  state.jobs = page.items;
+  state.jobCounts = page.counts;
+  state.jobsCursor = page.next_cursor;
   updateStats();
   renderSidebar();
   if (!state.activeJobId && state.jobs.length) {
@@ -1266,6 +1409,17 @@ async function refreshJobs() {
   }
 }
 
+async function loadMoreJobs() {
+  if (!state.jobsCursor) return;
+  const page = await fetchJobs(state.jobsCursor);
+  const known = new Set(state.jobs.map((j) => j.id));
+  state.jobs = state.jobs.concat(page.items.filter((j) => !known.has(j.id)));
+  state.jobCounts = page.counts;
+  state.jobsCursor = page.next_cursor;
+  updateStats();
+  renderSidebar();
+}
+
 async function startProcessing() {
   setError("");
   const file = refs.fileInput.files && refs.fileInput.files[0];
@@ -1282,6 +1436,7 @@ async function startProcessing() {
   fd.append("device", refs.device.value);
   fd.append("compute_type", refs.compute_type.value);
   fd.append("diarization", refs.diarization.checked ? "true" : "false");
+  fd.append("trim_silence", refs.trim_silence.checked ? "true" : "false");
   fd.append("summary_enabled", refs.summary_enabled.checked ? "true" : "false");
   fd.append("summary_style", refs.summary_style.value);
   fd.append("output_formats", JSON.stringify(selectedFormats()));
@@ -1451,8 +1606,7 @@ async function deleteSelectedHistoryItem() {
 
   if (state.activeJobId === job.id) {
     state.activeJobId = null;
-    clearInterval(state.pollTimer);
-    state.pollTimer = null;
+    stopActiveJobUpdates();
     resetOutputPanels();
   }
 
@@ -1676,7 +1830,7 @@ function attachEvents() {
     refs.tabHistory.classList.remove("text-[var(--text-muted)]");
     refs.tabQueue.classList.remove("tab-active", "text-[var(--text-primary)]");
     refs.tabQueue.classList.add("text-[var(--text-muted)]");
-    renderSidebar();
+    refreshJobs().catch((e) => setError(e.message));
   });
 
   refs.tabQueue.addEventListener("click", () => {
@@ -1688,7 +1842,7 @@ function attachEvents() {
       "text-[var(--text-primary)]",
     );
     refs.tabHistory.classList.add("text-[var(--text-muted)]");
-    renderSidebar();
+    refreshJobs().catch((e) => setError(e.message));
   });
 
   refs.uploadBtn.addEventListener("click", () => refs.fileInput.click());
@@ -1845,6 +1999,7 @@ async function init() {
   await loadConfig();
   await loadGlobalSettings();
   await refreshJobs();
+  followJobList();
 }
 
 init().catch((e) => {
@@ -0,0 +1,8 @@
+import sys
+import types
+
+try:
+    import whisperx  # noqa: F401
+except ImportError:
+    # Unit tests inject fake pipelines; only the module import has to succeed.
+    sys.modules["whisperx"] = types.ModuleType("whisperx")
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.schemas import JobCreateParams
+from app.services.transcription_service import TranscriptionService
+
+_LANGUAGE_BY_MARKER = {1.0: "en", 2.0: "de"}
+
+
+class FakePipeline:
+    """Mimics FasterWhisperPipeline: the tokenizer, and so the language, outlives a call."""
+
+    def __init__(self) -> None:
+        self.tokenizer = None
+        self.detections = 0
+
+    def detect_language(self, audio: np.ndarray) -> str:
+        self.detections += 1
+        return _LANGUAGE_BY_MARKER[float(audio[0])]
+
+    def transcribe(self, audio: np.ndarray, batch_size: int | None = None, language: str | None = None) -> dict:
+        if self.tokenizer is None:
+            language = language or self.detect_language(audio)
+            self.tokenizer = SimpleNamespace(language_code=language)
+        else:
+            language = language or self.tokenizer.language_code
+            if language != self.tokenizer.language_code:
+                self.tokenizer = SimpleNamespace(language_code=language)
+        return {"segments": [], "language": language}
+
+
+def _service_with(pipeline: FakePipeline) -> TranscriptionService:
+    service = TranscriptionService()
+    service._load_asr_model = lambda *args, **kwargs: (pipeline, True)  # type: ignore[method-assign]
+    return service
+
+
+def _audio(marker: float) -> np.ndarray:
+    return np.full(16000, marker, dtype=np.float32)
+
+
+def test_auto_detect_jobs_sharing_a_cached_model_detect_their_own_language():
+    pipeline = FakePipeline()
+    service = _service_with(pipeline)
+    params = JobCreateParams(language=None)
+
+    first = service._run_asr(_audio(1.0), params, "small", "cpu", None)
+    second = service._run_asr(_audio(2.0), params, "small", "cpu", None)
+
+    assert first["language"] == "en"
+    assert second["language"] == "de"
+    assert pipeline.detections == 2
+
+
+def test_fixed_language_is_passed_through_without_detection():
+    pipeline = FakePipeline()
+    service = _service_with(pipeline)
+
+    service._run_asr(_audio(1.0), JobCreateParams(language=None), "small", "cpu", None)
+    result = service._run_asr(_audio(1.0), JobCreateParams(language="de"), "small", "cpu", "de")
+
+    assert result["language"] == "de"
+    assert pipeline.detections == 1
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.schemas import JobCreateParams, JobState
+from app.services.job_service import JobService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_dir", tmp_path / "jobs")
+    monkeypatch.setattr(settings, "jobs_db_path", tmp_path / "jobs.db")
+    service = JobService()
+    yield service
+    service.store.close()
+
+
+class _Pool:
+    def __init__(self) -> None:
+        self.cancelled: list[str] = []
+
+    def cancel(self, job_id: str) -> bool:
+        self.cancelled.append(job_id)
+        return True
+
+
+def _batch(service: JobService, *job_ids: str) -> list[JobState]:
+    batch = []
+    for job_id in job_ids:
+        job = JobState(
+            id=job_id,
+            filename=f"{job_id}.wav",
+            source_path="",
+            audio_path=f"{job_id}.wav",
+            file_type="audio",
+            status="processing",
+            params=JobCreateParams(),
+        )
+        service.jobs[job_id] = job
+        batch.append(job)
+    return batch
+
+
+def _run(service: JobService, batch: list[JobState], during_pass) -> dict[str, object]:
+    handed_over: dict[str, object] = {}
+
+    async def fake_run(job, method, *args, progress_cb=None, **kwargs):
+        during_pass()
+        progress_cb(30, "transcribing", "tick")
+        return [{"segments": [], "language": "en"} for _ in batch]
+
+    async def fake_process(job_id, asr_result=None):
+        handed_over[job_id] = asr_result
+
+    service._run_transcription = fake_run
+    service._process_job = fake_process
+    asyncio.run(service._process_batch(batch))
+    return handed_over
+
+
+def test_cancelling_one_member_keeps_the_shared_pass(service):
+    service.worker_pool = pool = _Pool()
+    batch = _batch(service, "lead", "other")
+
+    handed_over = _run(service, batch, lambda: service.cancel_job("lead"))
+
+    assert pool.cancelled == []
+    assert handed_over["other"] is not None
+    assert service.jobs["lead"].cancel_requested
+    assert not service._running_batches
+
+
+def test_cancelling_every_member_aborts_the_pass(service):
+    service.worker_pool = pool = _Pool()
+    batch = _batch(service, "lead", "other")
+
+    def cancel_all():
+        service.cancel_job("other")
+        service.cancel_job("lead")
+
+    handed_over = _run(service, batch, cancel_all)
+
+    assert pool.cancelled == ["lead"]
+    assert handed_over == {"lead": None, "other": None}
@@ -0,0 +1,54 @@
+import asyncio
+
+from app.services.device_slots import DeviceSlots
+
+
+def _slots(gpus: int, per_device: int = 1) -> DeviceSlots:
+    slots = DeviceSlots()
+    slots.gpu_jobs_per_device = per_device
+    slots.gpu_count = gpus
+    slots.gpu_active = [0] * gpus
+    return slots
+
+
+def test_gpu_jobs_spread_across_devices():
+    slots = _slots(gpus=2)
+    seen = []
+
+    async def job():
+        async with slots.acquire("cuda") as device:
+            seen.append(device)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(job(), job())
+
+    asyncio.run(main())
+    assert sorted(seen) == ["cuda:0", "cuda:1"]
+
+
+def test_gpu_job_waits_for_a_free_device():
+    slots = _slots(gpus=2)
+    peak = []
+
+    async def job():
+        async with slots.acquire("cuda"):
+            peak.append(list(slots.gpu_active))
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(job() for _ in range(5)))
+
+    asyncio.run(main())
+    assert all(max(active) <= 1 for active in peak)
+    assert slots.gpu_active == [0, 0]
+
+
+def test_pinned_device_and_cpu():
+    slots = _slots(gpus=2)
+
+    async def main():
+        async with slots.acquire("cuda:1") as pinned, slots.acquire("cpu") as cpu:
+            return pinned, cpu
+
+    assert asyncio.run(main()) == ("cuda:1", "cpu")
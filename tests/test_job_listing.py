@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.config import settings
+from app.schemas import JobCreateParams, JobState
+from app.services.job_service import JobService
+
+_BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_dir", tmp_path / "jobs")
+    monkeypatch.setattr(settings, "jobs_db_path", tmp_path / "jobs.db")
+    service = JobService()
+    yield service
+    service.store.close()
+
+
+def _add(service: JobService, job_id: str, status: str, minutes: int) -> JobState:
+    stamp = _BASE + timedelta(minutes=minutes)
+    job = JobState(
+        id=job_id,
+        filename=f"{job_id}.wav",
+        source_path="",
+        audio_path="",
+        file_type="audio",
+        status=status,
+        params=JobCreateParams(),
+        created_at=stamp,
+        updated_at=stamp,
+    )
+    service.jobs[job_id] = job
+    service._save_job(job, flush=True)
+    return job
+
+
+def test_list_reads_unflushed_progress_without_flushing(service):
+    _add(service, "done", "completed", 0)
+    running = _add(service, "running", "queued", 1)
+
+    running.status = "processing"
+    running.progress = 40
+    running.updated_at = _BASE + timedelta(minutes=5)
+    service._save_job(running)
+
+    page = service.list_jobs()
+    assert [item.id for item in page.items] == ["running", "done"]
+    assert page.items[0].progress == 40
+    assert page.counts == {"completed": 1, "processing": 1}
+    # The write-behind buffer was left alone.
+    assert service.store.load("running").status == "queued"
+    assert "running" in service._dirty_job_ids
+
+    assert [item.id for item in service.list_jobs(statuses=["queued"]).items] == []
+    assert [item.id for item in service.list_jobs(statuses=["processing"]).items] == ["running"]
+
+
+def test_pages_merge_unflushed_jobs_in_order(service):
+    for minute in range(5):
+        _add(service, f"job-{minute}", "queued", minute)
+    moved = service.jobs["job-0"]
+    moved.progress = 10
+    moved.updated_at = _BASE + timedelta(minutes=10)
+    service._save_job(moved)
+
+    first = service.list_jobs(limit=2)
+    second = service.list_jobs(limit=2, cursor=first.next_cursor)
+    third = service.list_jobs(limit=2, cursor=second.next_cursor)
+    ids = [item.id for page in (first, second, third) for item in page.items]
+    assert ids == ["job-0", "job-4", "job-3", "job-2", "job-1"]
+    assert third.next_cursor is None
+
+
+def test_counts_follow_deletes_and_survive_restart(service):
+    _add(service, "a", "completed", 0)
+    _add(service, "b", "failed", 1)
+    service.delete_job("a", "a.wav")
+    assert service.list_jobs().counts == {"failed": 1}
+
+    restarted = JobService()
+    try:
+        assert restarted.list_jobs().counts == {"failed": 1}
+    finally:
+        restarted.store.close()
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import get_job_service, router
+from app.config import settings
+from app.schemas import JobCreateParams, JobState
+from app.services.job_service import JobService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "jobs_dir", tmp_path / "jobs")
+    monkeypatch.setattr(settings, "jobs_db_path", tmp_path / "jobs.db")
+    service = JobService()
+    job = JobState(id="job", filename="job.wav", source_path="", audio_path="", file_type="audio", params=JobCreateParams())
+    service.jobs[job.id] = job
+    service._save_job(job, flush=True)
+    yield service
+    service.store.close()
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_job_service] = lambda: service
+    return TestClient(app)
+
+
+def test_etag_follows_start_estimate(client, service, monkeypatch):
+    estimate = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(service, "estimated_start", lambda job_id: estimate)
+
+    first = client.get("/api/jobs/job?view=summary")
+    assert first.json()["estimated_start_at"] == "2026-01-01T00:00:00Z"
+    etag = first.headers["etag"]
+    assert client.get("/api/jobs/job?view=summary", headers={"If-None-Match": etag}).status_code == 304
+
+    estimate += timedelta(seconds=30)
+    moved = client.get("/api/jobs/job?view=summary", headers={"If-None-Match": etag})
+    assert moved.status_code == 200
+    assert moved.headers["etag"] != etag
+
+    # Bodies without the estimate keep their ETag while the estimate moves.
+    fields_etag = client.get("/api/jobs/job?fields=status").headers["etag"]
+    estimate += timedelta(seconds=30)
+    assert client.get("/api/jobs/job?fields=status", headers={"If-None-Match": fields_etag}).status_code == 304
+
+
+def test_openapi_documents_every_response_shape(client):
+    schema = client.get("/openapi.json").json()
+    response = schema["paths"]["/api/jobs/{job_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    refs = {option["$ref"].rsplit("/", 1)[-1] for option in response["anyOf"]}
+    assert refs == {"JobStatusResponse", "JobChanges", "JobStatusFields"}
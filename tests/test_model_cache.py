@@ -0,0 +1,68 @@
+from app.services.model_cache import MemoryLedger, ModelCache
+
+
+def _load(cache: ModelCache, key: str, size_mb: int, device: str = "cpu"):
+    return cache.get_or_load(key, lambda: object(), size_mb=size_mb, device=device)
+
+
+def test_caches_on_one_ledger_share_the_budget():
+    ledger = MemoryLedger({"ram": 1000, "vram": 1000})
+    asr = ModelCache("asr", ledger)
+    align = ModelCache("alignment", ledger)
+    diarization = ModelCache("diarization", ledger)
+
+    _load(asr, "small", 600)
+    _load(align, "en", 300)
+    _load(diarization, "pipeline", 300)
+
+    # The oldest entry, in another cache, made room for the newest.
+    assert ledger.used_mb("ram") == 600
+    assert asr.stats()["entries"] == []
+    assert [e["key"] for e in align.stats()["entries"]] == ["en"]
+
+
+def test_recently_used_entries_survive_eviction():
+    ledger = MemoryLedger({"ram": 1000, "vram": 0})
+    asr = ModelCache("asr", ledger)
+    align = ModelCache("alignment", ledger)
+
+    _load(asr, "small", 500)
+    _load(align, "en", 400)
+    _load(asr, "small", 500)  # hit: now the most recently used
+    _load(align, "de", 400)
+
+    assert [e["key"] for e in asr.stats()["entries"]] == ["small"]
+    assert [e["key"] for e in align.stats()["entries"]] == ["de"]
+
+
+def test_shrinking_the_budgets_evicts_down_to_the_share():
+    ledger = MemoryLedger({"ram": 1000, "vram": 0})
+    asr = ModelCache("asr", ledger)
+    _load(asr, "a", 400)
+    _load(asr, "b", 400)
+
+    ledger.set_budgets({"ram": 500, "vram": 0})
+
+    assert ledger.used_mb("ram") == 400
+    assert [e["key"] for e in asr.stats()["entries"]] == ["b"]
+
+
+def test_disabled_pool_keeps_nothing_resident():
+    ledger = MemoryLedger({"ram": 1000, "vram": 0})
+    asr = ModelCache("asr", ledger)
+
+    _, hit = _load(asr, "large", 100, device="cuda")
+    _, hit_again = _load(asr, "large", 100, device="cuda")
+
+    assert not hit and not hit_again
+    assert ledger.used_mb("vram") == 0
+
+
+def test_chunk_worker_share_comes_out_of_ram_only(monkeypatch):
+    from app.services import model_cache
+
+    ledger = MemoryLedger({"ram": 5000, "vram": 6000})
+    monkeypatch.setattr(model_cache, "model_memory_ledger", ledger)
+
+    assert model_cache.split_ram_budget(5) == {"ram": 1000, "vram": 0}
+    assert ledger.budgets_mb == {"ram": 1000, "vram": 6000}
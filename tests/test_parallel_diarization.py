@@ -0,0 +1,34 @@
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.schemas import JobCreateParams
+from app.services import transcription_service as ts
+
+
+def test_failed_asr_waits_for_diarization_in_flight(monkeypatch):
+    service = ts.TranscriptionService()
+    diarize_started = threading.Event()
+    diarize_finished = threading.Event()
+
+    def fake_diarize(audio, hf_token, device):
+        diarize_started.set()
+        time.sleep(0.1)
+        diarize_finished.set()
+
+    def failing_asr(*args, **kwargs):
+        diarize_started.wait(1)
+        raise RuntimeError("asr failed")
+
+    monkeypatch.setattr(ts.whisperx, "load_audio", lambda path: np.zeros(16000, dtype=np.float32), raising=False)
+    monkeypatch.setattr(service, "_diarize", fake_diarize)
+    monkeypatch.setattr(service, "_run_asr", failing_asr)
+
+    params = JobCreateParams(diarization=True, device="cpu")
+    with pytest.raises(RuntimeError, match="asr failed"):
+        service.transcribe(Path("unused.wav"), params, hf_token="token")
+    # The device slot is released when transcribe returns, so diarization must be done by then.
+    assert diarize_finished.is_set()
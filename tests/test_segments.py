@@ -0,0 +1,55 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.utils.segments import load_segments, select_segments, write_segments
+
+
+def _random_segments(seed: int, count: int = 300, shuffle: bool = False):
+    rng = random.Random(seed)
+    segments, t = [], 0.0
+    for index in range(count):
+        start = t
+        # Some segments are long and overlap the next ones; a few have no end time.
+        length = rng.uniform(0.5, 20.0) if rng.random() < 0.1 else rng.uniform(0.2, 4.0)
+        seg = {"start": round(start, 3), "end": round(start + length, 3), "text": f"segment {index}"}
+        if rng.random() < 0.05:
+            del seg["end"]
+        if rng.random() < 0.8:
+            seg["speaker"] = f"SPEAKER_{rng.randrange(3)}"
+        if rng.random() < 0.1:
+            seg["avg_logprob"] = -0.5
+        segments.append(seg)
+        t += rng.uniform(0.0, 3.0)
+    if shuffle:
+        rng.shuffle(segments)
+    return segments
+
+
+def _expected(segments, start, end, speaker):
+    starts = [seg.get("start", math.nan) for seg in segments]
+    matches = [
+        i
+        for i in np.argsort(starts, kind="stable")
+        if (end is None or segments[i]["start"] < end)
+        and (start is None or segments[i].get("end", -math.inf) > start)
+        and (speaker is None or segments[i].get("speaker") == speaker)
+    ]
+    return [int(i) for i in matches]
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_artifact_windows_match_a_linear_scan(tmp_path, shuffle):
+    segments = _random_segments(seed=1, shuffle=shuffle)
+    write_segments(tmp_path / "segments", segments)
+    artifact = load_segments(tmp_path / "segments")
+    rng = random.Random(2)
+    for _ in range(200):
+        start = rng.choice([None, rng.uniform(-5, 500)])
+        end = rng.choice([None, rng.uniform(0, 500)])
+        speaker = rng.choice([None, "SPEAKER_0", "SPEAKER_2", "nobody"])
+        expected = _expected(segments, start, end, speaker)
+        assert select_segments(artifact, start, end, speaker).tolist() == expected
+        assert select_segments(segments, start, end, speaker).tolist() == expected
@@ -0,0 +1,29 @@
+from app.utils.audio import remap_result_timestamps, to_original_time
+
+# Two kept spans: compact 0-2 s is original 0-2 s, compact 2-5 s is original 10-13 s.
+TIME_MAP = [(0.0, 0.0), (2.0, 10.0)]
+
+
+def test_end_on_span_boundary_stays_in_its_span():
+    assert to_original_time(2.0, TIME_MAP, end=True) == 2.0
+    assert to_original_time(2.0, TIME_MAP) == 10.0
+
+
+def test_times_inside_spans():
+    assert to_original_time(1.5, TIME_MAP, end=True) == 1.5
+    assert to_original_time(3.0, TIME_MAP) == 11.0
+    assert to_original_time(3.0, TIME_MAP, end=True) == 11.0
+
+
+def test_remap_segment_ending_on_boundary():
+    result = {
+        "segments": [
+            {"start": 0.5, "end": 2.0, "words": [{"start": 1.0, "end": 2.0}]},
+            {"start": 2.0, "end": 4.0},
+        ]
+    }
+    remapped = remap_result_timestamps(result, TIME_MAP)
+    first, second = remapped["segments"]
+    assert (first["start"], first["end"]) == (0.5, 2.0)
+    assert first["words"][0]["end"] == 2.0
+    assert (second["start"], second["end"]) == (10.0, 12.0)
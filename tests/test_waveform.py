@@ -0,0 +1,55 @@
+import wave
+
+import numpy as np
+import pytest
+
+from app.utils.audio import ensure_waveform, load_waveform, pcm_to_float
+
+SAMPLES = (np.sin(np.arange(16000) / 10) * 20000).astype("<i2")
+
+
+def _write_wav(path, rate=16000, channels=1):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(np.repeat(SAMPLES, channels).tobytes())
+
+
+def test_model_ready_wav_is_read_in_place(tmp_path):
+    _write_wav(tmp_path / "upload.wav")
+
+    def decode(source, target):
+        raise AssertionError("a model-ready WAV must not be decoded")
+
+    path = ensure_waveform(tmp_path / "upload.wav", tmp_path / "waveform.pcm", decode)
+    assert path == tmp_path / "upload.wav"
+    assert np.array_equal(load_waveform(path), SAMPLES)
+    assert np.array_equal(pcm_to_float(load_waveform(path)), SAMPLES.astype(np.float32) / 32768.0)
+
+
+def test_other_uploads_are_decoded_once(tmp_path):
+    _write_wav(tmp_path / "upload.wav", rate=44100)
+    calls = []
+
+    def decode(source, target):
+        calls.append(source)
+        target.write_bytes(SAMPLES.tobytes())
+
+    for _ in range(2):
+        path = ensure_waveform(tmp_path / "upload.wav", tmp_path / "waveform.pcm", decode)
+    assert path == tmp_path / "waveform.pcm"
+    assert len(calls) == 1
+    assert np.array_equal(load_waveform(path), SAMPLES)
+
+
+def test_failed_decode_leaves_nothing_behind(tmp_path):
+    (tmp_path / "upload.mp3").write_bytes(b"not audio")
+
+    def decode(source, target):
+        target.write_bytes(b"partial")
+        raise RuntimeError("FFmpeg decode failed")
+
+    with pytest.raises(RuntimeError):
+        ensure_waveform(tmp_path / "upload.mp3", tmp_path / "waveform.pcm", decode)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["upload.mp3"]